@@ -377,6 +377,17 @@ async def process_depth1(session_id: str):
     total_urls_discovered = 0
     results = []
 
+    # Card pages still to be sectioned are scraped interactively in concurrent
+    # batches of SCRAPER_INTERACTIVE_CONCURRENCY; the loop takes each result
+    # from prefetched, scraping the next batch when it reaches an unfetched card
+    pending_cards = []
+    if use_playwright:
+        sectioned_ids = set(await db[CARD_SECTIONS].distinct("card_id", {"session_id": session_id}))
+        pending_cards = [card for card in cards if card["card_id"] not in sectioned_ids]
+    pending_index = {card["card_id"]: i for i, card in enumerate(pending_cards)}
+    batch_size = max(1, settings.SCRAPER_INTERACTIVE_CONCURRENCY)
+    prefetched: Dict[str, Dict[str, Any]] = {}
+
     for card in cards:
         card_url = card["card_url"]
         card_name = card["card_name"]
@@ -403,8 +414,15 @@ async def process_depth1(session_id: str):
 
         if use_playwright:
             try:
-                from app.services.interactive_scraper import scrape_card_page_interactive
-                interactive_result = await scrape_card_page_interactive(card_url, card_name)
+                if card_id not in prefetched:
+                    from app.services.interactive_scraper import scrape_card_pages_interactive
+                    start = pending_index.get(card_id)
+                    batch = pending_cards[start:start + batch_size] if start is not None else [card]
+                    batch_results = await scrape_card_pages_interactive(
+                        [c["card_url"] for c in batch], [c["card_name"] for c in batch]
+                    )
+                    prefetched.update(zip((c["card_id"] for c in batch), batch_results))
+                interactive_result = prefetched.pop(card_id)
                 
                 if interactive_result.get("sections"):
                     logger.info(f"[V5] Interactive scrape: {len(interactive_result['sections'])} sections for {card_name}")
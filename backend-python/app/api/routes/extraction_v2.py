@@ -1030,9 +1030,10 @@ async def extract_intelligence(request: IntelligenceExtractionRequest):
     - All detected patterns (fees, cashback rates, etc.)
     - Section scores and selection criteria
     """
-    from app.services.intelligence_extraction_service import intelligence_extraction_service
+    from app.services.intelligence_extraction_service import get_intelligence_extraction_service
     from app.services.raw_extraction_storage_service import RawExtractionStorageService
     from app.core.database import get_database
+    intelligence_extraction_service = get_intelligence_extraction_service()
     
     try:
         url = str(request.url)
@@ -1311,9 +1312,10 @@ async def extract_intelligence_from_text(request: TextIntelligenceExtractionRequ
     2. Uses LLM to extract structured intelligence
     3. Returns sources for review before approval
     """
-    from app.services.intelligence_extraction_service import intelligence_extraction_service
+    from app.services.intelligence_extraction_service import get_intelligence_extraction_service
     from app.services.raw_extraction_storage_service import RawExtractionStorageService
     from app.core.database import get_database
+    intelligence_extraction_service = get_intelligence_extraction_service()
     
     try:
         text = request.text
@@ -1531,10 +1533,11 @@ async def extract_intelligence_from_pdf(
     3. Uses LLM to extract structured intelligence
     4. Returns sources for review before approval
     """
-    from app.services.intelligence_extraction_service import intelligence_extraction_service
+    from app.services.intelligence_extraction_service import get_intelligence_extraction_service
     from app.services.raw_extraction_storage_service import RawExtractionStorageService
     from app.services.pdf_service import pdf_service
     from app.core.database import get_database
+    intelligence_extraction_service = get_intelligence_extraction_service()
     
     try:
         # Validate file type
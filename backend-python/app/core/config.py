@@ -50,6 +50,8 @@ class Settings(BaseSettings):
     LLM_TIMEOUT: int = 180  # Allow enough time for comprehensive extraction
     LLM_MAX_RETRIES: int = 2
     LLM_NUM_PREDICT: int = 4096  # Enough tokens for full structured JSON output
+    LLM_STREAM_RESPONSES: bool = True  # Stream long extractions and build items as they arrive
+    OLLAMA_NUM_PARALLEL: int = 2  # Concurrent LLM calls; match the Ollama server's OLLAMA_NUM_PARALLEL
 
     # Vector Store (ChromaDB)
     CHROMA_PERSIST_DIR: str = "./chroma_data"
@@ -60,7 +62,9 @@ class Settings(BaseSettings):
     MAX_CONTENT_LENGTH: int = 100000
     MIN_TEXT_LENGTH: int = 100
     PDF_MAX_SIZE_MB: int = 50
+    PDF_MAX_WORKERS: int = 2  # Worker processes for PDF parsing
     EXTRACTION_TIMEOUT: int = 600
+    INTELLIGENCE_PREPROCESS_CACHE_SIZE: int = 64  # Preprocessed documents kept in memory (0 disables)
 
     # Batch Processing
     BATCH_MAX_SIZE: int = 100
@@ -100,6 +104,11 @@ class Settings(BaseSettings):
     SCRAPER_MAX_REDIRECTS: int = 5
     SCRAPER_RETRY_ATTEMPTS: int = 3
     SCRAPER_MAX_DEEP_LINKS: int = 10  # Maximum related links to follow
+    SCRAPER_LINK_CONCURRENCY: int = 5  # Related links fetched in parallel
+    SCRAPER_USE_SELECTOLAX: bool = True  # Faster related-page text extraction when installed
+    SCRAPER_LINK_CACHE_SIZE: int = 256  # Related-link texts kept in memory (0 disables)
+    SCRAPER_LINK_CACHE_TTL: int = 600  # Seconds before a cached link is revalidated
+    SCRAPER_INTERACTIVE_CONCURRENCY: int = 4  # Interactive (clicking) page scrapes run in parallel
 
     @property
     def cors_origins_list(self) -> List[str]:
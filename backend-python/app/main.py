@@ -56,6 +56,15 @@ async def lifespan(app: FastAPI):
         await redis_client.disconnect()
         logger.info("Redis disconnected")
 
+        from app.services.enhanced_web_scraper_service import enhanced_web_scraper_service
+        from app.services.pdf_service import pdf_service
+        from app.services.browser import shutdown_browser
+
+        await enhanced_web_scraper_service.aclose()
+        await pdf_service.aclose()
+        await shutdown_browser()
+        logger.info("Web scraper connections closed")
+
         logger.info("Application shutdown complete")
 
     except Exception as e:
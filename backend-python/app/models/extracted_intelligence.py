@@ -16,6 +16,7 @@ Key principles:
 - Support hierarchical and linked data
 """
 
+from collections import defaultdict
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
@@ -317,26 +318,19 @@ class ExtractedIntelligence(Document):
         self.total_items = len(self.intelligence)
         
         # Build category index
-        self.intelligence_by_category = {}
+        by_category = defaultdict(list)
         for item in self.intelligence:
-            cat = item.category
-            if cat not in self.intelligence_by_category:
-                self.intelligence_by_category[cat] = []
-            self.intelligence_by_category[cat].append(item.item_id)
+            by_category[item.category].append(item.item_id)
+        self.intelligence_by_category = dict(by_category)
         
-        # Build tags index
-        all_tags = set()
-        for item in self.intelligence:
-            all_tags.update(item.tags)
-        self.all_tags = list(all_tags)
+        # Build tags index (unique, in first-seen order)
+        self.all_tags = list(dict.fromkeys(tag for item in self.intelligence for tag in item.tags))
         
         # Build entities index
         seen_entities = {}
         for item in self.intelligence:
             for entity in item.entities:
-                key = f"{entity.type}:{entity.name}"
-                if key not in seen_entities:
-                    seen_entities[key] = entity
+                seen_entities.setdefault((entity.type, entity.name), entity)
         self.all_entities = list(seen_entities.values())
     
     def get_items_by_category(self, category: IntelligenceCategory) -> List[IntelligenceItem]:
@@ -404,7 +398,7 @@ def create_intelligence_item(
     import uuid
     
     item = IntelligenceItem(
-        item_id=str(uuid.uuid4())[:8],
+        item_id=uuid.uuid4().hex[:8],
         title=title,
         description=description,
         category=category,
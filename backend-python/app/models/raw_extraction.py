@@ -24,7 +24,7 @@ class KeywordMatch(BaseModel):
 
 class ExtractedSection(BaseModel):
     """A single section of extracted content with metadata."""
-    section_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    section_id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
     content: str
     content_length: int = 0
     
@@ -51,7 +51,7 @@ class ExtractedSection(BaseModel):
 
 class SourceDocument(BaseModel):
     """Metadata about a source document (web page or PDF)."""
-    source_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:8])
+    source_id: str = Field(default_factory=lambda: uuid.uuid4().hex[:8])
     url: str
     source_type: str = "web"  # web, pdf, api
     
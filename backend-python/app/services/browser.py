@@ -0,0 +1,42 @@
+"""
+Shared headless Chromium for the Playwright-based scrapers.
+
+One Playwright driver and one browser are launched on first use and shared
+by the enhanced and interactive scrapers; each scrape opens its own context.
+"""
+import asyncio
+
+from app.utils.logger import logger
+
+_pw = None
+_browser = None
+_browser_lock = asyncio.Lock()
+
+
+async def get_browser():
+    """Return the shared Chromium instance, launching it on first use."""
+    global _pw, _browser
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            from playwright.async_api import async_playwright
+
+            if _pw is None:
+                _pw = await async_playwright().start()
+            logger.info("Launching shared Chromium browser")
+            _browser = await _pw.chromium.launch(
+                headless=True,
+                args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu'],
+            )
+    return _browser
+
+
+async def shutdown_browser() -> None:
+    """Close the shared browser and stop Playwright (application shutdown)."""
+    global _pw, _browser
+    async with _browser_lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _pw is not None:
+            await _pw.stop()
+            _pw = None
@@ -10,16 +10,77 @@ Features:
 from typing import Optional, List, Dict, Any, Set, Tuple
 from urllib.parse import urljoin, urlparse
 import asyncio
+import functools
+import io
+import itertools
+import html as html_lib
+import posixpath
 import re
+import time
+from collections import OrderedDict, defaultdict
 import httpx
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag, NavigableString, CData
 from dataclasses import dataclass, field
+from hashlib import blake2b
+from operator import itemgetter
+
+try:
+    from selectolax.parser import HTMLParser as FastHTMLParser
+except ImportError:  # optional; BeautifulSoup is used instead
+    FastHTMLParser = None
 
 from app.core.config import settings
 from app.core.exceptions import WebScraperError
 from app.core.banks import detect_bank_from_url
+from app.services.browser import get_browser
 from app.utils.logger import logger
 
+PDF_HREF_RE = re.compile(r'''href\s*=\s*["']([^"']*\.pdf[^"']*)["']''', re.IGNORECASE)
+
+# Link patterns used by _extract_links_from_text
+MARKDOWN_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+BANK_URL_RE = re.compile(
+    r'https?://[^\s<>"\']+(?:emiratesnbd|bankfab|adcb|mashreq)[^\s<>"\']*', re.IGNORECASE
+)
+TEXT_PATH_RE = re.compile(r'(?:href|link|url)[=:]\s*["\']?(/[^\s"\'<>]+)', re.IGNORECASE)
+TRAILING_PUNCT_RE = re.compile(r'[.,;:!?\)\]]+$')
+
+# Linked resources that never contain card content
+SKIP_EXTENSIONS = frozenset({
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.zip', '.exe',
+    '.mp4', '.mp3', '.css', '.js', '.woff', '.woff2',
+})
+
+
+def _url_extension(url: str) -> str:
+    """Return the lowercased file extension of a URL's path ('' if none)."""
+    return posixpath.splitext(urlparse(url).path)[1].lower()
+
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+SECTION_BODY_TAGS = frozenset({'p', 'div', 'ul', 'ol', 'span'})
+NON_CONTENT_TAGS = frozenset({'script', 'style', 'noscript', 'svg', 'path'})
+BENEFIT_CLASSES = ('benefit', 'feature', 'offer', 'cashback', 'reward', 'perk')
+DOCUMENT_WRAPPER_TAGS = frozenset({'html', 'head', 'body'})
+
+# Order in which section types are presented to the LLM
+SECTION_PRIORITY = ('benefit', 'entitlement', 'merchant', 'fee', 'eligibility', 'terms', 'general')
+SECTION_PRIORITY_INDEX = {section_type: i for i, section_type in enumerate(SECTION_PRIORITY)}
+
+
+def _is_main_page_tag(name: str, attrs: Any = None) -> bool:
+    """Strainer predicate for the main page.
+
+    A strainer is only consulted for tags with no kept ancestor, so the
+    document wrappers are rejected to have it applied to their children:
+    top-level scripts, styles and SVGs are never built, while title/meta
+    and all body content are kept.
+    """
+    return name not in DOCUMENT_WRAPPER_TAGS and name not in NON_CONTENT_TAGS
+
+
+MAIN_PAGE_STRAINER = SoupStrainer(_is_main_page_tag)
+
 
 @dataclass
 class ExtractedSection:
@@ -40,6 +101,44 @@ class ExtractedTable:
     table_type: str  # 'cashback', 'fees', 'eligibility', 'merchants', 'benefits'
 
 
+@dataclass
+class DocumentIndex:
+    """Tags of interest collected from a single walk over a parsed page."""
+    headings: List[Tag] = field(default_factory=list)
+    tables: List[Tag] = field(default_factory=list)
+    non_content: List[Tag] = field(default_factory=list)
+    benefit_elements: List[Tuple[Tag, str]] = field(default_factory=list)  # (element, matched class)
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """Text-extraction settings derived once from a bank scraper config."""
+    ignore_selector: str  # all ignore_selectors joined into one selector group
+    content_selectors: Tuple[str, ...]  # tried in order; first match wins
+
+
+# Related-link cache key: the extracted text depends on the bank's extraction profile
+LinkCacheKey = Tuple[str, ExtractionProfile]
+
+
+@dataclass
+class LinkCacheEntry:
+    """Extracted text of a related URL and the validators it was served with."""
+    text: str
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def validators(self) -> Optional[Dict[str, str]]:
+        """Conditional-request headers for revalidating this entry, if any."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers or None
+
+
 @dataclass
 class ScrapedContent:
     """Complete scraped content from a URL."""
@@ -159,6 +258,36 @@ class EnhancedWebScraperService:
         'merchant': ['merchant', 'partner', 'retailer', 'store', 'restaurant', 'vendor', 'outlet'],
         'terms': ['terms', 'condition', 'limitation', 'restriction', 'valid', 'expiry'],
     }
+    
+    # Link text keywords that indicate valuable content
+    LINK_TEXT_KEYWORDS = (
+        'terms', 'condition', 'benefit', 'feature', 'detail',
+        'learn more', 'more info', 'eligibility', 'key facts',
+        'fee schedule', 'tariff', 'important', 'document',
+        'lounge', 'reward', 'offer', 'cashback', 'cinema',
+        'golf', 'concierge', 'insurance', 'credit shield',
+        'apply now', 'how to', 'faq', 'help'
+    )
+    
+    # Href keywords that indicate valuable content
+    LINK_PATH_KEYWORDS = (
+        'benefit', 'feature', 'offer', 'reward', 'lounge',
+        'key-fact', 'terms', 'condition', 'help-and-support',
+        'cinema', 'golf', 'concierge', 'insurance'
+    )
+    
+    # Single-pass multi-keyword matchers for the two lists above
+    LINK_TEXT_PATTERN = re.compile('|'.join(re.escape(kw) for kw in LINK_TEXT_KEYWORDS))
+    LINK_PATH_PATTERN = re.compile('|'.join(re.escape(kw) for kw in LINK_PATH_KEYWORDS))
+    
+    # One alternation per section type; anchored at word starts so plurals still match
+    SECTION_PATTERNS = {
+        section_type: re.compile(
+            r'\b(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + ')',
+            re.IGNORECASE
+        )
+        for section_type, keywords in SECTION_KEYWORDS.items()
+    }
 
     def __init__(self):
         self.user_agent = getattr(settings, 'SCRAPER_USER_AGENT', 
@@ -167,26 +296,44 @@ class EnhancedWebScraperService:
         self.max_redirects = getattr(settings, 'SCRAPER_MAX_REDIRECTS', 10)
         self.retry_attempts = getattr(settings, 'SCRAPER_RETRY_ATTEMPTS', 3)
         self.max_deep_links = getattr(settings, 'SCRAPER_MAX_DEEP_LINKS', 10)  # Increased from 5
+        self.link_concurrency = getattr(settings, 'SCRAPER_LINK_CONCURRENCY', 5)
+        self.use_selectolax = getattr(settings, 'SCRAPER_USE_SELECTOLAX', True) and FastHTMLParser is not None
+        self._related_semaphore = asyncio.BoundedSemaphore(self.link_concurrency)
+        self.link_cache_size = getattr(settings, 'SCRAPER_LINK_CACHE_SIZE', 256)
+        self.link_cache_ttl = getattr(settings, 'SCRAPER_LINK_CACHE_TTL', 600)
+        self._link_cache: "OrderedDict[LinkCacheKey, LinkCacheEntry]" = OrderedDict()
         self.max_content_length = getattr(settings, 'MAX_CONTENT_LENGTH', 80000)  # Increased from 50000
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                max_redirects=self.max_redirects,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                headers={"User-Agent": self.user_agent},
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections held by the scraper."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def _get_bank_config(self, url: str) -> Dict[str, Any]:
         """Get bank-specific configuration based on URL."""
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
-        
-        for bank_name, config in self.SCRAPER_CONFIGS.items():
-            if bank_name != 'default' and config['base_domain'] in domain:
-                logger.info(f"Using bank-specific config for: {bank_name}")
-                return config
-        
-        return self.SCRAPER_CONFIGS['default']
+        bank_name = _bank_config_for_host(urlparse(url).netloc.lower())
+        if bank_name != 'default':
+            logger.debug("Using bank-specific config for: {}", bank_name)
+        return self.SCRAPER_CONFIGS[bank_name]
 
     def _identify_section_type(self, text: str) -> str:
         """Identify the type of a section based on keywords."""
-        text_lower = text.lower()
-        
-        for section_type, keywords in self.SECTION_KEYWORDS.items():
-            if any(keyword in text_lower for keyword in keywords):
+        for section_type, pattern in self.SECTION_PATTERNS.items():
+            if pattern.search(text):
                 return section_type
         
         return 'general'
@@ -213,16 +360,17 @@ class EnhancedWebScraperService:
         Raises:
             WebScraperError: If scraping fails.
         """
-        logger.info(f"Starting comprehensive scrape of: {url} (playwright={use_playwright}, depth={max_depth})")
+        logger.info("Starting comprehensive scrape of: {} (playwright={}, depth={})", url, use_playwright, max_depth)
         
         bank_config = self._get_bank_config(url)
+        bank_name = detect_bank_from_url(url) or 'unknown'
         
         # Check if URL is a PDF
-        is_pdf = url.lower().endswith('.pdf') or '/pdf/' in url.lower() or '.pdf?' in url.lower()
+        is_pdf = _is_pdf_url(url)
         
         if is_pdf:
             # Handle PDF URL directly
-            logger.info(f"URL is a PDF, using PDF extraction service")
+            logger.info("URL is a PDF, using PDF extraction service")
             try:
                 from app.services.pdf_service import pdf_service
                 pdf_text = await pdf_service.extract_text_from_url(url)
@@ -244,28 +392,31 @@ class EnhancedWebScraperService:
                     pdf_links=[url],
                     metadata={
                         'scraped_at': asyncio.get_event_loop().time(),
-                        'bank_detected': detect_bank_from_url(url) or 'unknown',
+                        'bank_detected': bank_name,
                         'source_type': 'pdf',
                         'content_length': len(pdf_text) if pdf_text else 0
                     }
                 )
             except Exception as e:
-                logger.error(f"PDF extraction failed for {url}: {str(e)}")
+                logger.error("PDF extraction failed for {}: {}", url, e)
                 raise WebScraperError(f"Failed to extract PDF: {str(e)}")
         
         # First, scrape the main page (HTML)
-        main_soup, main_html = await self._fetch_and_parse(url, use_playwright=use_playwright)
+        main_soup, main_html = await self._fetch_and_parse(
+            url, use_playwright=use_playwright, parse_only=MAIN_PAGE_STRAINER
+        )
         
         # Extract page title
         title = self._extract_title(main_soup)
         
-        # Extract structured content
-        raw_text = self._extract_clean_text(main_soup, bank_config)
-        structured_sections = self._extract_sections(main_soup, bank_config)
-        tables = self._extract_tables(main_soup)
+        # Extract structured content from a single walk over the document
+        index = self._index_document(main_soup)
+        raw_text = self._extract_clean_text(main_soup, bank_config, index)
+        structured_sections = self._extract_sections(main_soup, bank_config, index)
+        tables = self._extract_tables(main_soup, index)
         
         # Find and extract PDF links
-        pdf_links = self._find_pdf_links(main_soup, url)
+        pdf_links = self._find_pdf_links(main_html, url)
         
         # Find and follow related links
         linked_content = {}
@@ -275,27 +426,29 @@ class EnhancedWebScraperService:
             
             # Also extract links from text content (markdown-style links)
             text_links = self._extract_links_from_text(raw_text, url)
+            seen_links = set(related_links)
             for link in text_links:
-                if link not in related_links:
+                if link not in seen_links:
+                    seen_links.add(link)
                     related_links.append(link)
             
-            logger.info(f"Found {len(related_links)} related links to follow")
+            logger.info("Found {} related links to follow", len(related_links))
             for link in related_links[:5]:  # Log first 5
-                logger.info(f"  - {link}")
+                logger.debug("  - {}", link)
             
             if related_links:
                 linked_content = await self._fetch_related_content(
                     related_links[:self.max_deep_links],
                     bank_config
                 )
-                logger.info(f"Successfully fetched content from {len(linked_content)} links")
+                logger.info("Successfully fetched content from {} links", len(linked_content))
         else:
-            logger.info(f"Not following links: follow_links={follow_links}, max_depth={max_depth}")
+            logger.info("Not following links: follow_links={}, max_depth={}", follow_links, max_depth)
         
         # Build metadata
         metadata = {
             'scraped_at': asyncio.get_event_loop().time(),
-            'bank_detected': detect_bank_from_url(url) or 'unknown',
+            'bank_detected': bank_name,
             'links_followed': len(linked_content),
             'pdfs_found': len(pdf_links),
             'tables_found': len(tables),
@@ -313,147 +466,157 @@ class EnhancedWebScraperService:
             metadata=metadata
         )
 
-    async def _fetch_and_parse(self, url: str, use_playwright: bool = False) -> Tuple[BeautifulSoup, str]:
+    async def _fetch_and_parse(
+        self,
+        url: str,
+        use_playwright: bool = False,
+        parse_only: Optional[SoupStrainer] = None
+    ) -> Tuple[BeautifulSoup, str]:
         """Fetch URL and return parsed BeautifulSoup object.
         
         Args:
             url: URL to fetch
             use_playwright: Use Playwright/Chromium for JavaScript rendering
+            parse_only: Restrict the parse to matching tags (uses the lxml parser)
         """
         # Try Playwright first if requested
         if use_playwright:
             html = await self._fetch_with_playwright(url)
             if html:
-                soup = BeautifulSoup(html, "html.parser")
+                soup = self._parse_html(html, parse_only)
                 return soup, html
             else:
-                logger.warning(f"Playwright failed for {url}, falling back to httpx")
+                logger.warning("Playwright failed for {}, falling back to httpx", url)
         
+        response = await self._fetch_html(url)
+        html = response.text
+        return self._parse_html(html, parse_only), html
+
+    async def _fetch_html(
+        self,
+        url: str,
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """Fetch URL over HTTP with retries.
+        
+        Returns the response once it carries HTML, or a 304 when extra_headers
+        hold conditional validators and the resource is unchanged. Non-HTML
+        text (plain-text T&Cs, JSON) is returned as decoded; empty bodies are
+        retried, and the last attempt's response is returned rather than raising.
+        """
         headers = {
             "User-Agent": self.user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9,ar;q=0.8",
-            # Explicitly exclude Brotli (br) as it may cause decoding issues
-            "Accept-Encoding": "gzip, deflate",
+            # httpx decodes br natively when the brotli package is installed
+            "Accept-Encoding": "gzip, deflate, br",
             "Connection": "keep-alive",
             "Cache-Control": "no-cache",
         }
+        if extra_headers:
+            headers.update(extra_headers)
 
         last_error = None
         for attempt in range(1, self.retry_attempts + 1):
             try:
-                async with httpx.AsyncClient(
-                    timeout=self.timeout,
-                    follow_redirects=True,
-                    max_redirects=self.max_redirects,
-                ) as client:
-                    response = await client.get(url, headers=headers)
-                    response.raise_for_status()
-                    
-                    # Get content - httpx should auto-decompress
-                    html = response.text
-                    
-                    # Check if we got valid HTML
-                    if html and '<' in html[:100]:
-                        soup = BeautifulSoup(html, "html.parser")
-                        return soup, html
-                    else:
-                        # Try to get raw content and decode
-                        content = response.content
-                        
-                        # Try to decompress if needed
-                        import gzip
-                        import zlib
-                        
-                        try:
-                            # Try gzip
-                            html = gzip.decompress(content).decode('utf-8')
-                        except:
-                            try:
-                                # Try zlib/deflate
-                                html = zlib.decompress(content, zlib.MAX_WBITS | 16).decode('utf-8')
-                            except:
-                                try:
-                                    # Try raw deflate
-                                    html = zlib.decompress(content, -zlib.MAX_WBITS).decode('utf-8')
-                                except:
-                                    # Try brotli if available
-                                    try:
-                                        import brotli
-                                        html = brotli.decompress(content).decode('utf-8')
-                                    except:
-                                        # Last resort - just decode as utf-8
-                                        html = content.decode('utf-8', errors='ignore')
-                        
-                        soup = BeautifulSoup(html, "html.parser")
-                        return soup, html
+                client = await self._get_client()
+                response = await client.get(url, headers=headers)
+                # Checked before raise_for_status, which treats 304 as an error
+                if response.status_code == 304 and extra_headers:
+                    return response
+                response.raise_for_status()
+
+                # httpx has already decoded the content-encoding
+                html = response.text
+                
+                # Non-HTML text is used leniently as decoded; only an empty body
+                # is retried, and the last attempt is returned as it is
+                if html.strip() or attempt == self.retry_attempts:
+                    if html and '<' not in html.lstrip()[:100]:
+                        logger.warning("Response from {} does not look like HTML; using decoded text", url)
+                    return response
+                
+                last_error = WebScraperError(f"Response from {url} was empty")
+                logger.warning("Fetch attempt {} returned an empty body", attempt)
 
             except httpx.HTTPStatusError as e:
                 last_error = WebScraperError(f"HTTP error {e.response.status_code}: {str(e)}")
-                logger.warning(f"Fetch attempt {attempt} failed: {str(e)}")
+                logger.warning("Fetch attempt {} failed: {}", attempt, e)
             except httpx.RequestError as e:
                 last_error = WebScraperError(f"Request error: {str(e)}")
-                logger.warning(f"Fetch attempt {attempt} failed: {str(e)}")
+                logger.warning("Fetch attempt {} failed: {}", attempt, e)
             except Exception as e:
                 last_error = WebScraperError(f"Unexpected error: {str(e)}")
-                logger.warning(f"Fetch attempt {attempt} failed: {str(e)}")
+                logger.warning("Fetch attempt {} failed: {}", attempt, e)
             
             if attempt < self.retry_attempts:
                 await asyncio.sleep(2 ** attempt)
 
         raise last_error
     
+    @staticmethod
+    def _parse_html(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        """Parse HTML, building only the strained subset of the tree when requested."""
+        if parse_only is not None:
+            return BeautifulSoup(html, "lxml", parse_only=parse_only)
+        return BeautifulSoup(html, "html.parser")
+
     async def _fetch_with_playwright(self, url: str) -> Optional[str]:
         """Fetch URL using Playwright with smart scrolling for JavaScript-rendered content."""
+        context = None
         try:
-            from playwright.async_api import async_playwright
+            logger.info("Using Playwright to fetch: {}", url)
             
-            logger.info(f"Using Playwright to fetch: {url}")
+            browser = await get_browser()
+            context = await browser.new_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            )
+            page = await context.new_page()
             
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
-                await page.set_extra_http_headers({
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                })
-                
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-                
-                # Smart scrolling to load lazy content
-                last_height = 0
-                scroll_attempts = 0
-                max_scrolls = 20
-                
-                while scroll_attempts < max_scrolls:
-                    current_height = await page.evaluate("document.body.scrollHeight")
-                    if current_height == last_height:
-                        break
-                    last_height = current_height
-                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await page.wait_for_timeout(1500)
-                    try:
-                        await page.wait_for_load_state("networkidle", timeout=3000)
-                    except:
-                        pass
-                    scroll_attempts += 1
-                
-                # Scroll back to top
-                await page.evaluate("window.scrollTo(0, 0)")
-                await page.wait_for_timeout(500)
-                
-                html = await page.content()
-                await browser.close()
-                
-                logger.info(f"Playwright scraped {len(html)} chars from {url}")
-                return html
+            await page.goto(url, wait_until="networkidle", timeout=30000)
+            
+            # Smart scrolling to load lazy content; stop once the height settles
+            last_height = 0
+            scroll_attempts = 0
+            max_scrolls = 20
+            
+            while scroll_attempts < max_scrolls:
+                current_height = await page.evaluate("document.body.scrollHeight")
+                if current_height == last_height:
+                    break
+                last_height = current_height
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                await page.wait_for_timeout(800)
+                try:
+                    await page.wait_for_load_state("networkidle", timeout=1500)
+                except Exception:
+                    pass
+                scroll_attempts += 1
+            
+            # Scroll back to top
+            await page.evaluate("window.scrollTo(0, 0)")
+            try:
+                await page.wait_for_function("document.readyState === 'complete'", timeout=1000)
+            except Exception:
+                pass
+            
+            html = await page.content()
+            
+            logger.info("Playwright scraped {} chars from {}", len(html), url)
+            return html
                 
         except ImportError:
             logger.warning("Playwright not installed, falling back to httpx")
             return None
         except Exception as e:
-            logger.error(f"Playwright error for {url}: {e}")
+            logger.error("Playwright error for {}: {}", url, e)
             return None
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
 
     def _extract_title(self, soup: BeautifulSoup) -> str:
         """Extract page title."""
@@ -474,53 +637,170 @@ class EnhancedWebScraperService:
         
         return "Unknown Card"
 
-    def _extract_clean_text(self, soup: BeautifulSoup, bank_config: Dict) -> str:
-        """Extract clean text content from soup."""
-        # Create a copy to avoid modifying original
-        soup_copy = BeautifulSoup(str(soup), 'html.parser')
+    def _index_document(self, soup: BeautifulSoup) -> DocumentIndex:
+        """Walk the document once, bucketing the tags each extractor needs."""
+        index = DocumentIndex()
+        
+        for node in soup.descendants:
+            if not isinstance(node, Tag):
+                continue
+            name = node.name
+            if name in HEADING_TAGS:
+                index.headings.append(node)
+            elif name == 'table':
+                index.tables.append(node)
+            elif name in NON_CONTENT_TAGS:
+                index.non_content.append(node)
+            
+            classes = node.get('class')
+            if classes:
+                class_attr = ' '.join(classes) if isinstance(classes, list) else classes
+                for class_name in BENEFIT_CLASSES:
+                    if class_name in class_attr:
+                        index.benefit_elements.append((node, class_name))
+                        break
+        
+        return index
+
+    def _extract_clean_text(
+        self,
+        soup: BeautifulSoup,
+        bank_config: Dict,
+        index: Optional[DocumentIndex] = None,
+        max_chars: Optional[int] = None
+    ) -> str:
+        """Extract clean text content from soup without mutating it.
         
-        # Remove unwanted elements
-        for selector in bank_config.get('ignore_selectors', []):
-            for element in soup_copy.select(selector):
-                element.decompose()
+        Stops walking the document once max_chars (default MAX_CONTENT_LENGTH)
+        characters have been collected.
+        """
+        profile = _bank_extraction_profile(bank_config)
         
-        # Remove scripts, styles, etc.
-        for tag in soup_copy(['script', 'style', 'noscript', 'svg', 'path']):
-            tag.decompose()
+        # Collect nodes to skip instead of decomposing them on a copy
+        ignored: Set[int] = set()
+        if profile.ignore_selector:
+            ignored = {id(element) for element in soup.select(profile.ignore_selector)}
+        non_content = index.non_content if index else soup(list(NON_CONTENT_TAGS))
+        ignored |= {id(tag) for tag in non_content}
         
         # Try to find main content area
         main_content = None
-        for selector in bank_config.get('content_selectors', []):
-            main_content = soup_copy.select_one(selector)
+        for selector in profile.content_selectors:
+            for candidate in soup.select(selector):
+                if not self._is_ignored(candidate, ignored):
+                    main_content = candidate
+                    break
             if main_content:
                 break
         
         if not main_content:
-            main_content = soup_copy.body or soup_copy
+            main_content = soup.body or soup
+            if main_content is soup:
+                # A strained soup has no <body>; keep the <title> it retains out of the text
+                ignored |= {id(tag) for tag in soup.find_all('title')}
         
-        # Get text with proper spacing
-        text = main_content.get_text(separator='\n', strip=True)
+        # Get text with proper spacing, stopping once the length limit is reached
+        limit = max_chars or self.max_content_length
+        lines = []
+        length = 0
+        truncated = False
+        stripped_lines = (
+            line.strip()
+            for string in self._iter_text_nodes(main_content, ignored)
+            for line in string.splitlines()
+        )
+        for line in stripped_lines:
+            if not line:
+                continue
+            separator = 1 if lines else 0
+            if length + separator + len(line) > limit:
+                room = limit - length - separator
+                if room >= 0:
+                    lines.append(line[:room])
+                truncated = True
+                break
+            lines.append(line)
+            length += separator + len(line)
         
-        # Clean up whitespace
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
         text = '\n'.join(lines)
+        if truncated:
+            text += "\n[Content truncated...]"
+        
+        return text
+
+    def _extract_related_text(self, html: str, bank_config: Dict, max_chars: int) -> str:
+        """Extract clean text from a related page, preferring selectolax when installed."""
+        if not self.use_selectolax:
+            # Parsed in full so text in spans, forms and bare table cells is kept
+            soup = self._parse_html(html)
+            return self._extract_clean_text(soup, bank_config, max_chars=max_chars)
         
-        # Truncate if too long
-        if len(text) > self.max_content_length:
-            text = text[:self.max_content_length] + "\n[Content truncated...]"
+        profile = _bank_extraction_profile(bank_config)
+        tree = FastHTMLParser(html)
+        tree.strip_tags(list(NON_CONTENT_TAGS))
+        if profile.ignore_selector:
+            for node in tree.css(profile.ignore_selector):
+                node.decompose()
         
+        main_content = None
+        for selector in profile.content_selectors:
+            main_content = tree.css_first(selector)
+            if main_content is not None:
+                break
+        if main_content is None:
+            main_content = tree.body or tree.root
+        if main_content is None:
+            return ''
+        
+        text = main_content.text(separator='\n', strip=True)
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        text = '\n'.join(lines)
+        if len(text) > max_chars:
+            text = text[:max_chars] + "\n[Content truncated...]"
         return text
 
+    @staticmethod
+    def _is_ignored(element: Tag, ignored: Set[int]) -> bool:
+        """Check whether an element or any of its ancestors is ignored."""
+        if id(element) in ignored:
+            return True
+        return any(id(parent) in ignored for parent in element.parents)
+
+    @staticmethod
+    def _iter_text_nodes(root: Tag, ignored: Set[int]):
+        """Yield text nodes under root in document order, skipping ignored subtrees."""
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Tag):
+                if id(node) in ignored:
+                    continue
+                stack.extend(reversed(node.contents))
+            elif type(node) in (NavigableString, CData):
+                yield node
+
     def _extract_sections(
         self,
         soup: BeautifulSoup,
-        bank_config: Dict
+        bank_config: Dict,
+        index: Optional[DocumentIndex] = None
     ) -> List[ExtractedSection]:
         """Extract structured sections from the page."""
         sections = []
+        seen_keys: Set[bytes] = set()
+        
+        def is_new_section(title: str, content: str) -> bool:
+            """Record a (title, content prefix) key; False if already seen."""
+            key = blake2b(f"{title}\x00{content[:100]}".encode(), digest_size=8).digest()
+            if key in seen_keys:
+                return False
+            seen_keys.add(key)
+            return True
         
         # Find all heading elements and their following content
-        headings = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        if index is None:
+            index = self._index_document(soup)
+        headings = index.headings
         
         for heading in headings:
             heading_text = heading.get_text(strip=True)
@@ -529,65 +809,63 @@ class EnhancedWebScraperService:
             
             # Get content following the heading
             content_parts = []
-            sibling = heading.find_next_sibling()
-            
-            while sibling and sibling.name not in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
-                if sibling.name in ['p', 'div', 'ul', 'ol', 'span']:
+            for sibling in heading.next_siblings:
+                name = getattr(sibling, 'name', None)
+                if name in HEADING_TAGS:
+                    break
+                if name in SECTION_BODY_TAGS:
                     text = sibling.get_text(strip=True)
                     if text:
                         content_parts.append(text)
-                sibling = sibling.find_next_sibling()
             
             if content_parts:
+                content = '\n'.join(content_parts)
+                if not is_new_section(heading_text, content):
+                    continue
                 section_type = self._identify_section_type(heading_text + ' ' + ' '.join(content_parts[:3]))
                 sections.append(ExtractedSection(
                     title=heading_text,
-                    content='\n'.join(content_parts),
+                    content=content,
                     section_type=section_type,
                     metadata={'heading_level': heading.name}
                 ))
         
         # Also look for sections by class patterns
-        benefit_patterns = [
-            '[class*="benefit"]', '[class*="feature"]', '[class*="offer"]',
-            '[class*="cashback"]', '[class*="reward"]', '[class*="perk"]'
-        ]
+        for elem, matched in index.benefit_elements:
+            content = elem.get_text(strip=True)
+            if not content or len(content) <= 20:
+                continue
+            
+            pattern = f'[class*="{matched}"]'
+            
+            title = ''
+            # Try to find a title within the element
+            title_elem = elem.find(['h2', 'h3', 'h4', 'h5', 'strong', 'b'])
+            if title_elem:
+                title = title_elem.get_text(strip=True)
+            title = title or f"Section from {pattern}"
+            if not is_new_section(title, content):
+                continue
+            
+            section_type = self._identify_section_type(content)
+            sections.append(ExtractedSection(
+                title=title,
+                content=content,
+                section_type=section_type,
+                metadata={'source_selector': pattern}
+            ))
         
-        for pattern in benefit_patterns:
-            elements = soup.select(pattern)
-            for elem in elements:
-                title = ''
-                # Try to find a title within the element
-                title_elem = elem.find(['h2', 'h3', 'h4', 'h5', 'strong', 'b'])
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                
-                content = elem.get_text(strip=True)
-                if content and len(content) > 20:
-                    section_type = self._identify_section_type(content)
-                    sections.append(ExtractedSection(
-                        title=title or f"Section from {pattern}",
-                        content=content,
-                        section_type=section_type,
-                        metadata={'source_selector': pattern}
-                    ))
-        
-        # Deduplicate sections
-        seen = set()
-        unique_sections = []
-        for section in sections:
-            key = (section.title, section.content[:100])
-            if key not in seen:
-                seen.add(key)
-                unique_sections.append(section)
-        
-        return unique_sections
-
-    def _extract_tables(self, soup: BeautifulSoup) -> List[ExtractedTable]:
+        return sections
+
+    def _extract_tables(
+        self,
+        soup: BeautifulSoup,
+        index: Optional[DocumentIndex] = None
+    ) -> List[ExtractedTable]:
         """Extract and parse tables from the page."""
         tables = []
         
-        for table in soup.find_all('table'):
+        for table in (index.tables if index else soup.find_all('table')):
             # Get context (nearby heading or caption)
             context = ''
             caption = table.find('caption')
@@ -630,18 +908,13 @@ class EnhancedWebScraperService:
         
         return tables
 
-    def _find_pdf_links(self, soup: BeautifulSoup, base_url: str) -> List[str]:
-        """Find all PDF links on the page."""
-        pdf_links = []
-        
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            if '.pdf' in href.lower():
-                full_url = urljoin(base_url, href)
-                if full_url not in pdf_links:
-                    pdf_links.append(full_url)
-        
-        return pdf_links
+    def _find_pdf_links(self, html: str, base_url: str) -> List[str]:
+        """Find all PDF links in the raw page HTML."""
+        pdf_links = dict.fromkeys(
+            urljoin(base_url, html_lib.unescape(match.group(1)))
+            for match in PDF_HREF_RE.finditer(html)
+        )
+        return list(pdf_links)
 
     def _find_related_links(
         self,
@@ -650,19 +923,11 @@ class EnhancedWebScraperService:
         bank_config: Dict
     ) -> List[str]:
         """Find related links worth following."""
-        related_links = []
+        related_links: List[Tuple[int, str]] = []
+        seen: Set[str] = set()
         parsed_base = urlparse(base_url)
         base_domain = parsed_base.netloc
-        
-        # Important keywords that indicate valuable content
-        important_keywords = [
-            'terms', 'condition', 'benefit', 'feature', 'detail',
-            'learn more', 'more info', 'eligibility', 'key facts',
-            'fee schedule', 'tariff', 'important', 'document',
-            'lounge', 'reward', 'offer', 'cashback', 'cinema',
-            'golf', 'concierge', 'insurance', 'credit shield',
-            'apply now', 'how to', 'faq', 'help'
-        ]
+        related_path_re = _compile_related_paths(tuple(bank_config.get('related_paths', [])))
         
         for link in soup.find_all('a', href=True):
             href = link['href']
@@ -678,125 +943,216 @@ class EnhancedWebScraperService:
                 continue
             
             # Skip if already added
-            if full_url in related_links:
+            if full_url in seen:
                 continue
             
             should_add = False
             
             # Check if path matches related patterns
-            for pattern in bank_config.get('related_paths', []):
-                if re.search(pattern, parsed.path, re.IGNORECASE):
-                    should_add = True
-                    break
+            if related_path_re and related_path_re.search(parsed.path):
+                should_add = True
             
             # Check link text for relevance
             if not should_add:
-                link_text = link.get_text(strip=True).lower()
-                if any(kw in link_text for kw in important_keywords):
+                link_text_lower = link.get_text(strip=True).lower()
+                if self.LINK_TEXT_PATTERN.search(link_text_lower):
                     should_add = True
             
             # Check href for keywords
             if not should_add:
                 href_lower = href.lower()
-                path_keywords = ['benefit', 'feature', 'offer', 'reward', 'lounge', 
-                               'key-fact', 'terms', 'condition', 'help-and-support',
-                               'cinema', 'golf', 'concierge', 'insurance']
-                if any(kw in href_lower for kw in path_keywords):
+                if self.LINK_PATH_PATTERN.search(href_lower):
                     should_add = True
             
             if should_add:
-                related_links.append(full_url)
+                seen.add(full_url)
+                related_links.append((self._link_priority(full_url), full_url))
         
-        # Sort by importance - PDFs and key-facts first
-        def link_priority(url):
-            url_lower = url.lower()
-            if '.pdf' in url_lower:
-                return 0
-            if 'key-fact' in url_lower:
-                return 1
-            if 'terms' in url_lower or 'condition' in url_lower:
-                return 2
-            if 'benefit' in url_lower or 'feature' in url_lower:
-                return 3
-            return 4
+        # Sort by importance - PDFs and key-facts first (stable, so page order breaks ties)
+        related_links.sort(key=itemgetter(0))
         
-        related_links.sort(key=link_priority)
-        
-        return related_links
+        return [url for _, url in related_links]
+
+    @staticmethod
+    def _link_priority(url: str) -> int:
+        """Rank a related link; lower values are followed first."""
+        url_lower = url.lower()
+        if '.pdf' in url_lower:
+            return 0
+        if 'key-fact' in url_lower:
+            return 1
+        if 'terms' in url_lower or 'condition' in url_lower:
+            return 2
+        if 'benefit' in url_lower or 'feature' in url_lower:
+            return 3
+        return 4
 
     def _extract_links_from_text(self, text: str, base_url: str) -> List[str]:
         """Extract URLs from text content (markdown links, plain URLs)."""
         links = []
+        seen: Set[str] = set()
         parsed_base = urlparse(base_url)
         base_domain = parsed_base.netloc
         base_root = f"{parsed_base.scheme}://{parsed_base.netloc}"
         
         # Markdown-style links: [text](url)
-        markdown_pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-        for match in re.finditer(markdown_pattern, text):
-            url = match.group(2)
-            if url.startswith('/'):
-                url = urljoin(base_root, url)
-            if base_domain in url or url.startswith('/'):
-                links.append(url)
+        if '](' in text:
+            for match in MARKDOWN_LINK_RE.finditer(text):
+                url = match.group(2)
+                if url.startswith('/'):
+                    url = _join_root(base_root, url)
+                if (base_domain in url or url.startswith('/')) and url not in seen:
+                    seen.add(url)
+                    links.append(url)
+        
+        # Cheap substring checks below skip regex scans that cannot match
+        text_lower = text.lower()
         
         # Plain URLs
-        url_pattern = r'https?://[^\s<>"\']+(?:emiratesnbd|bankfab|adcb|mashreq)[^\s<>"\']*'
-        for match in re.finditer(url_pattern, text, re.IGNORECASE):
-            url = match.group(0)
-            # Clean up trailing punctuation
-            url = re.sub(r'[.,;:!?\)\]]+$', '', url)
-            if url not in links:
-                links.append(url)
+        if 'http' in text_lower:
+            for match in BANK_URL_RE.finditer(text):
+                # Clean up trailing punctuation
+                url = TRAILING_PUNCT_RE.sub('', match.group(0))
+                if url not in seen:
+                    seen.add(url)
+                    links.append(url)
         
         # Relative paths mentioned in text
-        path_pattern = r'(?:href|link|url)[=:]\s*["\']?(/[^\s"\'<>]+)'
-        for match in re.finditer(path_pattern, text, re.IGNORECASE):
-            path = match.group(1)
-            full_url = urljoin(base_root, path)
-            if full_url not in links:
-                links.append(full_url)
-        
-        logger.info(f"Extracted {len(links)} links from text content")
+        if '/' in text and ('href' in text_lower or 'link' in text_lower or 'url' in text_lower):
+            for match in TEXT_PATH_RE.finditer(text):
+                full_url = _join_root(base_root, match.group(1))
+                if full_url not in seen:
+                    seen.add(full_url)
+                    links.append(full_url)
+        
+        logger.debug("Extracted {} links from text content", len(links))
         return links
+
     async def _fetch_related_content(
         self,
         urls: List[str],
         bank_config: Dict
     ) -> Dict[str, str]:
         """Fetch content from related URLs, handling both web pages and PDFs."""
-        content = {}
+        urls = [url for url in urls if _url_extension(url) not in SKIP_EXTENSIONS]
+        
+        # Classify each URL once; PDFs and pages share the related-link limit
+        tasks = [
+            asyncio.create_task(self._fetch_related_url(url, bank_config, _is_pdf_url(url)))
+            for url in urls
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        for url in urls:
+        return {url: text for url, text in zip(urls, results) if isinstance(text, str) and text}
+
+    async def _probe_pdf(self, url: str) -> Optional[httpx.Headers]:
+        """Return HEAD response headers for a PDF link, or None if the probe fails."""
+        try:
+            client = await self._get_client()
+            response = await client.head(url, timeout=5)
+            response.raise_for_status()
+            return response.headers
+        except httpx.HTTPError as e:
+            # Some servers reject HEAD; fall back to downloading the file
+            logger.debug("HEAD probe failed for {}: {}", url, e)
+            return None
+
+    def _get_cached_link(self, key: LinkCacheKey) -> Optional[LinkCacheEntry]:
+        """Return the cache entry for a related URL, fresh or stale."""
+        entry = self._link_cache.get(key)
+        if entry is not None:
+            self._link_cache.move_to_end(key)
+        return entry
+
+    def _is_fresh(self, entry: LinkCacheEntry) -> bool:
+        """Whether a cache entry can be served without revalidation."""
+        return time.monotonic() - entry.stored_at <= self.link_cache_ttl
+
+    def _cache_link(
+        self,
+        key: LinkCacheKey,
+        text: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Store related-URL text, evicting the least recently used entries."""
+        if self.link_cache_size <= 0:
+            return
+        self._link_cache[key] = LinkCacheEntry(text, time.monotonic(), etag, last_modified)
+        self._link_cache.move_to_end(key)
+        while len(self._link_cache) > self.link_cache_size:
+            self._link_cache.popitem(last=False)
+
+    async def _fetch_related_url(self, url: str, bank_config: Dict, is_pdf: bool) -> Optional[str]:
+        """Fetch a single related URL; a service-wide semaphore bounds concurrency."""
+        cache_key = (url, _bank_extraction_profile(bank_config))
+        cached = self._get_cached_link(cache_key)
+        if cached is not None and self._is_fresh(cached):
+            logger.debug("Related link cache hit: {}", url)
+            return cached.text
+        
+        async with self._related_semaphore:
             try:
-                logger.info(f"Fetching related link: {url}")
-                
-                # Check if it's a PDF
-                if url.lower().endswith('.pdf') or '/pdf/' in url.lower() or '.pdf?' in url.lower():
+                logger.info("Fetching related link: {}", url)
+
+                if is_pdf:
                     # Use PDF service for PDF files
                     try:
                         from app.services.pdf_service import pdf_service
-                        pdf_text = await pdf_service.extract_text_from_url(url)
+                        
+                        # Cheap HEAD probe: skip HTML/text or oversized responses and
+                        # reuse a stale cache entry when the validators still match
+                        probe = await self._probe_pdf(url)
+                        etag = last_modified = None
+                        if probe is not None:
+                            content_type = probe.get('content-type', '').lower()
+                            content_length = _content_length(probe)
+                            if _is_text_content_type(content_type):
+                                logger.warning("Skipping PDF link served as {}: {}", content_type, url)
+                                return None
+                            if content_length > pdf_service.max_size_bytes:
+                                logger.warning("Skipping PDF of {} bytes: {}", content_length, url)
+                                return None
+                            etag = probe.get('etag')
+                            last_modified = probe.get('last-modified')
+                            if cached is not None and (etag or last_modified) and (
+                                (etag, last_modified) == (cached.etag, cached.last_modified)
+                            ):
+                                logger.debug("Related PDF not modified: {}", url)
+                                self._cache_link(cache_key, cached.text, etag, last_modified)
+                                return cached.text
+                        
+                        pdf_text = await pdf_service.extract_text_from_url(url, max_chars=50000)
                         if pdf_text and len(pdf_text) > 50:
-                            content[url] = pdf_text[:50000]  # Allow more content from PDFs
-                            logger.info(f"Extracted {len(pdf_text)} chars from PDF: {url}")
-                        else:
-                            logger.warning(f"PDF extraction yielded little content: {url}")
+                            logger.info("Extracted {} chars from PDF: {}", len(pdf_text), url)
+                            text = pdf_text[:50000]  # Allow more content from PDFs
+                            self._cache_link(cache_key, text, etag, last_modified)
+                            return text
+                        logger.warning("PDF extraction yielded little content: {}", url)
                     except Exception as pdf_error:
-                        logger.warning(f"PDF extraction failed for {url}: {str(pdf_error)}")
-                        continue
+                        logger.warning("PDF extraction failed for {}: {}", url, pdf_error)
                 else:
-                    # Regular web page
-                    soup, _ = await self._fetch_and_parse(url)
-                    text = self._extract_clean_text(soup, bank_config)
+                    # Regular web page; revalidate a stale cache entry when we can
+                    validators = cached.validators() if cached is not None else None
+                    response = await self._fetch_html(url, extra_headers=validators)
+                    if response.status_code == 304 and cached is not None:
+                        logger.debug("Related link not modified: {}", url)
+                        self._cache_link(cache_key, cached.text, cached.etag, cached.last_modified)
+                        return cached.text
+                    
+                    text = self._extract_related_text(response.text, bank_config, max_chars=10000)
                     if text and len(text) > 100:
-                        content[url] = text[:10000]  # Limit per link
-                        
+                        text = text[:10000]  # Limit per link (drops the truncation marker)
+                        self._cache_link(
+                            cache_key, text,
+                            response.headers.get('etag'),
+                            response.headers.get('last-modified')
+                        )
+                        return text
+
             except Exception as e:
-                logger.warning(f"Failed to fetch related link {url}: {str(e)}")
-                continue
-        
-        return content
+                logger.warning("Failed to fetch related link {}: {}", url, e)
+            return None
 
     async def scrape_url(self, url: str) -> str:
         """
@@ -816,52 +1172,142 @@ class EnhancedWebScraperService:
         Returns:
             Formatted string optimized for LLM processing
         """
-        parts = []
+        buf = io.StringIO()
+        write = buf.write
         
         # Title and URL
-        parts.append(f"=== CREDIT CARD: {content.title} ===")
-        parts.append(f"Source: {content.url}\n")
+        write(f"=== CREDIT CARD: {content.title} ===\n")
+        write(f"Source: {content.url}\n\n")
         
         # Structured sections by type
-        sections_by_type = {}
+        sections_by_type = defaultdict(list)
         for section in content.structured_sections:
-            if section.section_type not in sections_by_type:
-                sections_by_type[section.section_type] = []
             sections_by_type[section.section_type].append(section)
         
-        # Output sections in priority order
-        priority_order = ['benefit', 'entitlement', 'merchant', 'fee', 'eligibility', 'terms', 'general']
+        # Output sections in priority order, then any types not in the list
+        ordered_types = [t for t in SECTION_PRIORITY if t in sections_by_type]
+        ordered_types.extend(t for t in sections_by_type if t not in SECTION_PRIORITY_INDEX)
         
-        for section_type in priority_order:
-            if section_type in sections_by_type:
-                parts.append(f"\n=== {section_type.upper()} SECTIONS ===")
-                for section in sections_by_type[section_type]:
-                    parts.append(f"\n## {section.title}")
-                    parts.append(section.content)
+        for section_type in ordered_types:
+            write(f"\n=== {section_type.upper()} SECTIONS ===\n")
+            for section in sections_by_type[section_type]:
+                write(f"\n## {section.title}\n")
+                write(section.content)
+                write('\n')
         
         # Tables
         if content.tables:
-            parts.append("\n=== EXTRACTED TABLES ===")
+            write("\n=== EXTRACTED TABLES ===\n")
+            sep = " | "
+            header_rule = "-" * 50 + "\n"
             for i, table in enumerate(content.tables):
-                parts.append(f"\n--- Table {i+1}: {table.context} (Type: {table.table_type}) ---")
+                write(f"\n--- Table {i+1}: {table.context} (Type: {table.table_type}) ---\n")
                 if table.headers:
-                    parts.append(" | ".join(table.headers))
-                    parts.append("-" * 50)
-                for row in table.rows:
-                    parts.append(" | ".join(row))
+                    write(sep.join(table.headers))
+                    write('\n')
+                    write(header_rule)
+                # Drop blank rows and consecutive repeats; they only cost LLM tokens
+                rows = (row for row in table.rows if any(cell.strip() for cell in row))
+                for row, _ in itertools.groupby(rows):
+                    write(sep.join(cell.strip() or '-' for cell in row))
+                    write('\n')
         
         # Linked content
         if content.linked_content:
-            parts.append("\n=== ADDITIONAL DETAILS FROM LINKED PAGES ===")
-            for url, text in content.linked_content.items():
-                parts.append(f"\n--- From: {url} ---")
-                parts.append(text[:5000])  # Limit per link
+            write("\n=== ADDITIONAL DETAILS FROM LINKED PAGES ===\n")
+            write(''.join(
+                f"\n--- From: {url} ---\n{text[:5000]}\n"  # Limit per link
+                for url, text in content.linked_content.items()
+            ))
         
         # Raw text as fallback
-        parts.append("\n=== FULL PAGE TEXT ===")
-        parts.append(content.raw_text)
+        write("\n=== FULL PAGE TEXT ===\n")
+        write(content.raw_text)
         
-        return '\n'.join(parts)
+        return buf.getvalue()
+
+
+_BANK_DOMAINS: Dict[str, str] = {
+    config['base_domain']: bank_name
+    for bank_name, config in EnhancedWebScraperService.SCRAPER_CONFIGS.items()
+    if bank_name != 'default'
+}
+
+
+def _is_pdf_url(url: str) -> bool:
+    """Whether a URL points at a PDF (by path extension or a /pdf/ segment)."""
+    url_lower = url.lower()
+    return '/pdf/' in url_lower or posixpath.splitext(urlparse(url_lower).path)[1] == '.pdf'
+
+
+def _is_text_content_type(content_type: str) -> bool:
+    """Whether a lowercased Content-Type is an HTML/text page rather than a document.
+
+    Anything else (application/pdf, octet-stream, force-download, missing)
+    may still be a PDF and is downloaded.
+    """
+    return content_type.startswith(('text/', 'application/xhtml'))
+
+
+def _content_length(headers: httpx.Headers) -> int:
+    """Parse Content-Length, treating a missing or malformed header as unknown (0)."""
+    try:
+        return max(int(headers.get('content-length') or 0), 0)
+    except ValueError:
+        return 0
+
+
+def _join_root(base_root: str, path: str) -> str:
+    """Join a root-relative path onto "scheme://host" without a full urljoin."""
+    # Protocol-relative URLs and dot segments still need urljoin's resolution
+    if path.startswith('//') or '/.' in path:
+        return urljoin(base_root, path)
+    return base_root + path
+
+
+@functools.lru_cache(maxsize=64)
+def _extraction_profile(
+    ignore_selectors: Tuple[str, ...],
+    content_selectors: Tuple[str, ...]
+) -> ExtractionProfile:
+    """Build (and memoize) the text-extraction profile for a bank config."""
+    return ExtractionProfile(
+        ignore_selector=', '.join(ignore_selectors),
+        content_selectors=content_selectors,
+    )
+
+
+def _bank_extraction_profile(bank_config: Dict) -> ExtractionProfile:
+    """Return the text-extraction profile for a bank scraper config."""
+    return _extraction_profile(
+        tuple(bank_config.get('ignore_selectors', [])),
+        tuple(bank_config.get('content_selectors', []))
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_related_paths(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """Combine a bank's related_paths into one case-insensitive pattern."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=256)
+def _bank_config_for_host(host: str) -> str:
+    """Resolve a hostname to its SCRAPER_CONFIGS key."""
+    # Fast path: the host or one of its parent domains is a known base domain
+    labels = host.split('.')
+    for i in range(len(labels) - 1):
+        bank_name = _BANK_DOMAINS.get('.'.join(labels[i:]))
+        if bank_name:
+            return bank_name
+    
+    for base_domain, bank_name in _BANK_DOMAINS.items():
+        if base_domain in host:
+            return bank_name
+    
+    return 'default'
 
 
 # Global instance
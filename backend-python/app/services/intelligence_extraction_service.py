@@ -5,10 +5,16 @@ Uses LLM to extract flexible intelligence items rather than fitting into rigid s
 The goal is to preserve all valuable information with proper context and relationships.
 """
 
+import asyncio
+import heapq
+import itertools
 import json
 import uuid
 import re
-from typing import Optional, List, Dict, Any
+import sys
+from collections import OrderedDict, defaultdict
+from hashlib import blake2b
+from typing import Optional, List, Dict, Any, Callable, Iterator, Tuple
 from datetime import datetime
 
 from app.models.extracted_intelligence import (
@@ -17,10 +23,60 @@ from app.models.extracted_intelligence import (
     ValueSpec, Condition, Entity, SourceReference, ValueType, ConditionType
 )
 from app.core.config import settings
+from app.services.cache_service import cache_service
 from app.services.ollama_client import ollama_client, parse_llm_json
 from app.utils.logger import logger
 
 
+# Patterns used by _preprocess_content and the section analysis in
+# extract_intelligence, compiled once at import time.
+WHITESPACE_RE = re.compile(r'[ \t]+')
+
+# Paragraph/segment boundaries: line breaks, sentence ends (period + space +
+# capital) and bullet/pipe separators, combined into one alternation. The
+# scraper emits one line per text node, so single newlines must split too;
+# _iter_segments merges short lines ("Annual Fee: AED 500") into the next one.
+# Percentages and AED amounts are deliberately not boundaries.
+SEGMENT_BREAK_RE = re.compile(
+    r'\n+'
+    r'|(?<=[.!?])\s+(?=[A-Z])'
+    r'|\s*[|•●○]\s*'
+)
+
+SOURCE_MARKER_RE = re.compile(r'(--- Content from .+? ---|\n--- Content from [^\n]+\n)')
+SOURCE_MARKER_START_RE = re.compile(r'--- Content from')
+CURRENCY_RE = re.compile(r'aed|usd|gbp|eur|\$|£|€', re.IGNORECASE)
+VALUE_AMOUNT_RE = re.compile(r'\d+%|\d+\s*aed|aed\s*\d+')
+# Currency / percentage / any digit, scanned together by _value_flags
+VALUE_FLAGS_RE = re.compile(r'(aed|usd|gbp|eur|\$|£|€)|(\d+%)|\d')
+
+# Fields built into ValueSpecs for fees and eligibility (the LLM uses the same keys)
+FEE_VALUE_FIELDS = ("annual_fee", "joining_fee", "supplementary_card_fee")
+ELIGIBILITY_VALUE_FIELDS = ("minimum_salary", "minimum_age", "maximum_age")
+
+# ValueType lookup by value string (unknown types fall back to TEXT)
+VALUE_TYPES = {value_type.value: value_type for value_type in ValueType}
+
+# Benefit terms that boost a section's relevance score
+BENEFIT_TERMS = ('lounge', 'cashback', 'reward', 'points', 'miles', 'insurance', 'discount')
+
+# Benefit indicator patterns - used to split long paragraphs into benefit-focused sections
+BENEFIT_INDICATORS = (
+    # Bullets and list markers
+    r'(?:^|\n)\s*[•●○■□▪▸►]\s*',
+    r'(?:^|\n)\s*[-–—]\s+(?=[A-Z])',
+    r'(?:^|\n)\s*\d+[.)]\s+',
+    r'(?:^|\n)\s*[a-z][.)]\s+',
+    # Benefit keywords at start of sentence
+    r'(?:^|\n)(?:Enjoy|Get|Earn|Receive|Benefit|Access|Save|Free|Complimentary|Exclusive)\s+',
+    r'(?:^|\n)(?:Up to|Upto|Minimum|Maximum|Starting from)\s+\d+',
+    # Percentage/amount patterns
+    r'(?:^|\n)[^.]*?\d+%\s+(?:cashback|discount|off|reward|back)',
+    r'(?:^|\n)[^.]*?(?:AED|USD|EUR)\s*\d+',
+)
+BENEFIT_SPLIT_RE = re.compile('|'.join(f'(?:{p})' for p in BENEFIT_INDICATORS))
+
+
 class IntelligenceExtractionService:
     """Service to extract flexible intelligence from credit card content."""
     
@@ -28,19 +84,31 @@ class IntelligenceExtractionService:
         self.ollama_base_url = settings.OLLAMA_BASE_URL
         self.default_model = settings.DEFAULT_MODEL
         self.timeout = 300.0  # Increased to 5 minutes for complex extractions
+        self.stream_responses = getattr(settings, 'LLM_STREAM_RESPONSES', True)
+        self.preprocess_cache_size = getattr(settings, 'INTELLIGENCE_PREPROCESS_CACHE_SIZE', 64)
+        self._preprocess_cache: "OrderedDict[Tuple, Tuple[str, Tuple]]" = OrderedDict()
     
-    # Default keywords for relevance scoring
-    DEFAULT_KEYWORDS = [
+    # High-signal keywords that drive default relevance scoring
+    CORE_KEYWORDS = [
         'benefit', 'reward', 'cashback', 'discount', 'lounge', 'airport',
         'travel', 'insurance', 'annual fee', 'interest rate', 'eligibility',
         'minimum salary', 'points', 'miles', 'complimentary', 'free',
         'cinema', 'golf', 'concierge', 'valet', 'dining', 'shopping',
-        'partner', 'merchant', 'offer', 'promotion', 'feature',
         'aed', 'usd', '%', 'per month', 'per year', 'waived',
+        'credit limit', 'supplementary'
+    ]
+    
+    # Generic card terms found on almost every page - they only add a small
+    # boost to sections that already scored on something else
+    CONTEXT_KEYWORDS = [
+        'partner', 'merchant', 'offer', 'promotion', 'feature',
         'mastercard', 'visa', 'diners', 'platinum', 'signature', 'world',
-        'credit limit', 'supplementary', 'apply', 'requirement'
+        'apply', 'requirement'
     ]
     
+    # Default keywords for relevance scoring
+    DEFAULT_KEYWORDS = CORE_KEYWORDS + CONTEXT_KEYWORDS
+    
     def _preprocess_content(self, content: str, max_length: int = 12000, keywords: List[str] = None) -> str:
         """
         Preprocess and clean content to extract the most relevant parts.
@@ -51,71 +119,76 @@ class IntelligenceExtractionService:
             max_length: Maximum length of output
             keywords: Custom keywords for relevance scoring (uses defaults if None)
         """
-        # Use custom keywords if provided, otherwise use defaults
-        relevant_keywords = keywords if keywords else self.DEFAULT_KEYWORDS
-        
-        logger.info(f"Using {len(relevant_keywords)} keywords for relevance scoring")
-        logger.info(f"Original content length: {len(content)}")
-        
-        # Debug: Log a sample of the content to see its structure
-        logger.info(f"Content sample (first 500 chars): {content[:500]}")
-        logger.info(f"Content has 'Content from' marker: {'--- Content from' in content}")
-        logger.info(f"Newline count in content: {content.count(chr(10))}")
-        
-        # Benefit indicator patterns - used to split long paragraphs into benefit-focused sections
-        benefit_indicators = [
-            # Bullets and list markers
-            r'(?:^|\n)\s*[•●○■□▪▸►]\s*',
-            r'(?:^|\n)\s*[-–—]\s+(?=[A-Z])',
-            r'(?:^|\n)\s*\d+[.)]\s+',
-            r'(?:^|\n)\s*[a-z][.)]\s+',
-            # Benefit keywords at start of sentence
-            r'(?:^|\n)(?:Enjoy|Get|Earn|Receive|Benefit|Access|Save|Free|Complimentary|Exclusive)\s+',
-            r'(?:^|\n)(?:Up to|Upto|Minimum|Maximum|Starting from)\s+\d+',
-            # Percentage/amount patterns
-            r'(?:^|\n)[^.]*?\d+%\s+(?:cashback|discount|off|reward|back)',
-            r'(?:^|\n)[^.]*?(?:AED|USD|EUR)\s*\d+',
-        ]
+        # Use custom keywords if provided, otherwise the default core/context split
+        if keywords:
+            relevant_keywords, context_keywords = keywords, []
+        else:
+            relevant_keywords, context_keywords = self.CORE_KEYWORDS, self.CONTEXT_KEYWORDS
+        
+        # Identical content (re-runs, retries) is preprocessed only once
+        cache_key = (
+            blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest(),
+            max_length,
+            tuple(keywords) if keywords else None,
+        )
+        cached = self._preprocess_cache.get(cache_key)
+        if cached is not None:
+            self._preprocess_cache.move_to_end(cache_key)
+            logger.debug("Preprocessed content cache hit ({} chars)", len(content))
+            # Callers get their own section list; the cached one is never handed out
+            return cached[0], list(cached[1])
+        
+        logger.debug("Using {} keywords for relevance scoring", len(relevant_keywords))
+        logger.debug("Original content length: {}", len(content))
+        
+        # Debug: Log a sample of the content to see its structure (only
+        # evaluated when DEBUG records are actually emitted)
+        lazy_logger = logger.opt(lazy=True)
+        lazy_logger.debug("Content sample (first 500 chars): {}", lambda: content[:500])
+        lazy_logger.debug("Newline count in content: {}", lambda: content.count('\n'))
         
         # Split by content source markers first (most reliable)
         source_sections = []
         if '--- Content from' in content:
-            # Debug: Show where markers are
-            marker_positions = [m.start() for m in re.finditer(r'--- Content from', content)]
-            logger.info(f"Found {len(marker_positions)} '--- Content from' markers at positions: {marker_positions[:5]}...")
-            
-            # Sample the marker format
-            first_marker_pos = content.find('--- Content from')
-            marker_sample = content[first_marker_pos:first_marker_pos+200]
-            logger.info(f"First marker sample: {marker_sample[:150]}")
+            # Debug: Show where markers are and sample the marker format
+            lazy_logger.debug(
+                "'--- Content from' markers at positions: {}...",
+                lambda: [m.start() for m in itertools.islice(SOURCE_MARKER_START_RE.finditer(content), 5)],
+            )
+            lazy_logger.debug(
+                "First marker sample: {}",
+                lambda: content[content.find('--- Content from'):][:150],
+            )
             
             # More flexible regex - match everything until end of line or triple dash
-            parts = re.split(r'(--- Content from .+? ---|\n--- Content from [^\n]+\n)', content)
-            logger.info(f"Split into {len(parts)} parts")
+            parts = SOURCE_MARKER_RE.split(content)
+            logger.debug("Split into {} parts", len(parts))
             
             current_source = "main"
-            current_content = ""
+            current_parts = []
             
-            for i, part in enumerate(parts):
+            for part in parts:
                 if '--- Content from' in part:
-                    if current_content.strip():
-                        source_sections.append((current_source, current_content.strip()))
-                    current_source = part.strip()
-                    current_content = ""
+                    current_content = ''.join(current_parts).strip()
+                    if current_content:
+                        source_sections.append((current_source, current_content))
+                    current_source = sys.intern(part.strip())
+                    current_parts = []
                 else:
-                    current_content += part
+                    current_parts.append(part)
             
-            if current_content.strip():
-                source_sections.append((current_source, current_content.strip()))
+            current_content = ''.join(current_parts).strip()
+            if current_content:
+                source_sections.append((current_source, current_content))
             
-            logger.info(f"Split into {len(source_sections)} source sections")
+            logger.debug("Split into {} source sections", len(source_sections))
             
             # If still 0, try alternative approach - split by just the marker text
             if len(source_sections) == 0:
-                logger.info("Trying alternative split approach...")
+                logger.debug("Trying alternative split approach...")
                 # Split by newline + marker
                 alt_parts = content.split('\n--- Content from ')
-                logger.info(f"Alternative split gave {len(alt_parts)} parts")
+                logger.debug("Alternative split gave {} parts", len(alt_parts))
                 
                 for i, part in enumerate(alt_parts):
                     if i == 0:
@@ -126,91 +199,53 @@ class IntelligenceExtractionService:
                         # Find where the marker ends (look for ---\n or just take first line as source)
                         newline_pos = part.find('\n')
                         if newline_pos > 0:
-                            source_name = '--- Content from ' + part[:newline_pos].strip()
+                            source_name = sys.intern('--- Content from ' + part[:newline_pos].strip())
                             section_content = part[newline_pos:].strip()
                             if section_content:
                                 source_sections.append((source_name, section_content))
                 
-                logger.info(f"Alternative split gave {len(source_sections)} source sections")
+                logger.debug("Alternative split gave {} source sections", len(source_sections))
         else:
             source_sections = [("main", content)]
-            logger.info(f"No source markers found, treating as single section")
+            logger.debug("No source markers found, treating as single section")
         
         # Now split each source section into paragraphs
         all_sections = []
         for source, source_content in source_sections:
-            # Clean whitespace but preserve structure
-            source_content = re.sub(r'[ \t]+', ' ', source_content)
-            source_content = re.sub(r'\n{3,}', '\n\n', source_content)
+            # Collapse runs of spaces/tabs; newlines are segment boundaries below
+            source_content = WHITESPACE_RE.sub(' ', source_content)
             
             # Log what we're working with
-            newline_count = source_content.count('\n')
-            logger.info(f"Source section has {len(source_content)} chars, {newline_count} newlines")
-            
-            # Try different splitting strategies
-            paragraphs = []
-            
-            # Strategy 1: Try double newlines first
-            paragraphs = [p.strip() for p in re.split(r'\n\n+', source_content) if p.strip()]
-            logger.info(f"Double newline split: {len(paragraphs)} paragraphs")
-            
-            # Strategy 2: If we got very few paragraphs, try single newlines
-            if len(paragraphs) < 5:
-                single_split = [p.strip() for p in source_content.split('\n') if p.strip() and len(p.strip()) > 30]
-                if len(single_split) > len(paragraphs):
-                    paragraphs = single_split
-                    logger.info(f"Single newline split: {len(paragraphs)} paragraphs")
-            
-            # Strategy 3: If still too few, try sentence splitting (period + space + capital)
-            if len(paragraphs) < 5 and len(source_content) > 500:
-                sentence_split = [p.strip() for p in re.split(r'(?<=[.!?])\s+(?=[A-Z])', source_content) if p.strip() and len(p.strip()) > 30]
-                if len(sentence_split) > len(paragraphs):
-                    paragraphs = sentence_split
-                    logger.info(f"Sentence split: {len(paragraphs)} paragraphs")
-            
-            # Strategy 4: If STILL too few (content is one big blob), use aggressive splitting
-            if len(paragraphs) < 5 and len(source_content) > 500:
-                # Split by any period followed by space
-                aggressive_split = [p.strip() for p in re.split(r'\.\s+', source_content) if p.strip() and len(p.strip()) > 20]
-                if len(aggressive_split) > len(paragraphs):
-                    paragraphs = aggressive_split
-                    logger.info(f"Aggressive period split: {len(paragraphs)} paragraphs")
+            lazy_logger.debug(
+                "Source section has {} chars, {} newlines",
+                lambda: len(source_content), lambda: source_content.count('\n'),
+            )
             
-            # Strategy 5: If content has common separators, split on those
-            if len(paragraphs) < 10 and len(source_content) > 1000:
-                # Try splitting on common benefit separators
-                separator_patterns = [
-                    r'\s*[|•●○]\s*',  # Pipe or bullet
-                    r'\s*;\s*',        # Semicolon
-                    r'\s+(?=\d+%)',    # Before percentages
-                    r'\s+(?=AED\s*\d)', # Before AED amounts
-                    r'\s+(?=Enjoy|Get|Earn|Free|Complimentary)\s+',  # Before benefit words
-                ]
-                
-                for sep_pattern in separator_patterns:
-                    sep_split = [p.strip() for p in re.split(sep_pattern, source_content) if p.strip() and len(p.strip()) > 20]
-                    if len(sep_split) > len(paragraphs):
-                        paragraphs = sep_split
-                        logger.info(f"Separator pattern split ({sep_pattern[:20]}...): {len(paragraphs)} paragraphs")
-                        break
+            # Single pass over the content: line breaks, sentence ends and
+            # bullet/pipe separators are segment boundaries; short fragments are
+            # merged into the neighbouring segment rather than dropped.
+            paragraphs = list(_iter_segments(source_content, SEGMENT_BREAK_RE))
+            logger.debug("Segment split: {} paragraphs", len(paragraphs))
             
-            # Strategy 6: Last resort - chunk by character count
+            # Last resort for unstructured blobs - chunk by character count
             if len(paragraphs) < 5 and len(source_content) > 1000:
                 chunk_size = 500
-                chunks = []
-                for i in range(0, len(source_content), chunk_size):
-                    chunk = source_content[i:i+chunk_size].strip()
-                    if len(chunk) > 50:
-                        chunks.append(chunk)
+                chunks = [
+                    chunk for chunk in (
+                        source_content[i:i + chunk_size].strip()
+                        for i in range(0, len(source_content), chunk_size)
+                    )
+                    if len(chunk) > 50
+                ]
                 if len(chunks) > len(paragraphs):
                     paragraphs = chunks
-                    logger.info(f"Chunk split ({chunk_size} chars): {len(paragraphs)} chunks")
+                    logger.debug("Chunk split ({} chars): {} chunks", chunk_size, len(paragraphs))
             
             for para in paragraphs:
                 if len(para) >= 30:  # Minimum length
                     all_sections.append((source, para))
         
-        logger.info(f"Split content into {len(all_sections)} total paragraphs/sections")
+        logger.debug("Split content into {} total paragraphs/sections", len(all_sections))
         
         # ADDITIONAL: Split long sections further using benefit indicators
         # This helps extract individual benefits from dense paragraphs
@@ -221,70 +256,56 @@ class IntelligenceExtractionService:
                 refined_sections.append((source, section))
                 continue
             
-            # Try to split by benefit indicators
-            sub_sections = [section]  # Start with the full section
-            
-            for pattern in benefit_indicators:
-                new_sub_sections = []
-                for sub in sub_sections:
-                    if len(sub) < 200:
-                        new_sub_sections.append(sub)
-                        continue
-                    
-                    # Split by this pattern
-                    parts = re.split(pattern, sub)
-                    for part in parts:
-                        part = part.strip()
-                        if len(part) >= 30:
-                            new_sub_sections.append(part)
-                
-                sub_sections = new_sub_sections
-            
-            # Add all sub-sections
-            for sub in sub_sections:
-                if len(sub) >= 30:
-                    refined_sections.append((source, sub))
+            # Split by benefit indicators (all patterns in one pass)
+            refined_sections.extend((source, part) for part in _iter_segments(section, BENEFIT_SPLIT_RE))
         
-        logger.info(f"After keyword-based splitting: {len(refined_sections)} refined sections")
+        logger.debug("After keyword-based splitting: {} refined sections", len(refined_sections))
         
         # Score each section by relevance
+        keywords_lower = tuple(kw.lower() for kw in relevant_keywords)
+        context_lower = tuple(kw.lower() for kw in context_keywords)
         scored_sections = []
         for source, section in refined_sections:
+            section_lower = section.lower()
+            
             # Count keyword matches
-            score = sum(1 for kw in relevant_keywords if kw.lower() in section.lower())
+            score = len(_matched_keywords(section_lower, keywords_lower))
             
             # Boost sections with numbers/percentages (likely contain specific values)
-            if re.search(r'\d+%|\d+\s*aed|aed\s*\d+', section.lower()):
+            if VALUE_AMOUNT_RE.search(section_lower):
                 score += 5
             
             # Boost sections with currency amounts
-            if re.search(r'aed|usd|gbp|eur|\$|£|€', section.lower()):
+            if CURRENCY_RE.search(section_lower):
                 score += 2
             
             # Boost sections mentioning specific benefits
-            benefit_terms = ['lounge', 'cashback', 'reward', 'points', 'miles', 'insurance', 'discount']
-            for term in benefit_terms:
-                if term in section.lower():
-                    score += 2
+            score += sum(2 for term in BENEFIT_TERMS if term in section_lower)
+            
+            # Generic context terms only break ties between relevant sections
+            if score > 0 and context_lower and _matched_keywords(section_lower, context_lower):
+                score += 1
             
             if score > 0:  # Only include sections with at least one keyword match
                 scored_sections.append((score, section))
         
-        logger.info(f"After keyword filtering: {len(scored_sections)} relevant sections")
+        logger.debug("After keyword filtering: {} relevant sections", len(scored_sections))
         
-        # Sort by score (descending) and take top sections
-        scored_sections.sort(key=lambda x: x[0], reverse=True)
+        # Build final content from most relevant sections and track selection.
+        # Sections are popped from a heap in score order (ties keep document
+        # order) only until the remaining budget is smaller than the shortest
+        # section - nothing after that point could be selected, so the rest
+        # is never sorted.
+        heap = [(-score, i, section) for i, (score, section) in enumerate(scored_sections)]
+        heapq.heapify(heap)
+        shortest = min((len(section) for _, section in scored_sections), default=0)
         
-        # Log top scoring sections
-        if scored_sections:
-            logger.info(f"Top 3 section scores: {[s[0] for s in scored_sections[:3]]}")
-        
-        # Build final content from most relevant sections and track selection
         final_content = []
         current_length = 0
         sections_with_selection = []  # (score, content, is_selected)
         
-        for score, section in scored_sections:
+        while heap and (not final_content or max_length - current_length >= shortest):
+            neg_score, _, section = heapq.heappop(heap)
             is_selected = False
             if current_length + len(section) <= max_length:
                 final_content.append(section)
@@ -296,11 +317,20 @@ class IntelligenceExtractionService:
                 current_length = max_length
                 is_selected = True
             
-            sections_with_selection.append((score, section, is_selected))
+            sections_with_selection.append((-neg_score, section, is_selected))
+        
+        # Sections that can no longer fit, in the same score order
+        sections_with_selection.extend(
+            (-neg_score, section, False) for neg_score, _, section in sorted(heap)
+        )
+        
+        # Log top scoring sections
+        if sections_with_selection:
+            lazy_logger.debug("Top 3 section scores: {}", lambda: [s[0] for s in sections_with_selection[:3]])
         
         result = '\n\n'.join(final_content)
         
-        logger.info(f"Preprocessed content: {len(content)} -> {len(result)} chars, {len(final_content)} sections selected")
+        logger.info("Preprocessed content: {} -> {} chars, {} sections selected", len(content), len(result), len(final_content))
         
         # Fallback: if still no content, just truncate original
         if not result:
@@ -308,8 +338,18 @@ class IntelligenceExtractionService:
             result = content[:max_length]
             sections_with_selection = [(0, content[:max_length], True)]
         
+        self._cache_preprocessed(cache_key, (result, tuple(sections_with_selection)))
         return result, sections_with_selection  # Return sections with selection info
     
+    def _cache_preprocessed(self, key: Tuple, value: Tuple[str, Tuple]) -> None:
+        """Store a preprocessing result, evicting the least recently used entries."""
+        if self.preprocess_cache_size <= 0:
+            return
+        self._preprocess_cache[key] = value
+        self._preprocess_cache.move_to_end(key)
+        while len(self._preprocess_cache) > self.preprocess_cache_size:
+            self._preprocess_cache.popitem(last=False)
+    
     async def extract_intelligence(
         self,
         content: str,
@@ -341,60 +381,168 @@ class IntelligenceExtractionService:
         # Increased to 20000 chars to capture more benefits
         processed_content, scored_sections = self._preprocess_content(content, max_length=20000, keywords=custom_keywords)
         
-        # Store sections if raw_storage is provided
-        if raw_storage and raw_extraction_id and scored_sections:
-            try:
-                # Prepare section data for storage
-                sections_data = []
-                for score, section_content, is_selected in scored_sections:
-                    # Analyze section for storage
-                    keywords_to_use = custom_keywords if custom_keywords else self.DEFAULT_KEYWORDS
-                    keyword_matches = []
-                    for kw in keywords_to_use:
-                        if kw.lower() in section_content.lower():
-                            count = section_content.lower().count(kw.lower())
-                            keyword_matches.append({"keyword": kw, "count": count})
-                    
-                    sections_data.append({
-                        "content": section_content,
-                        "score": score,
-                        "keyword_matches": keyword_matches,
-                        "keyword_count": len(keyword_matches),
-                        "has_currency": bool(re.search(r'aed|usd|gbp|eur|\$|£|€', section_content, re.IGNORECASE)),
-                        "has_percentage": bool(re.search(r'\d+%', section_content)),
-                        "has_numbers": bool(re.search(r'\d+', section_content)),
-                        "is_selected": is_selected
-                    })
-                
-                await raw_storage.add_sections(raw_extraction_id, sections_data, source_url)
-                logger.info(f"Stored {len(sections_data)} sections to raw extraction {raw_extraction_id}")
-            except Exception as e:
-                logger.warning(f"Failed to store sections: {e}")
-        
         # Build the extraction prompt
         prompt = self._build_extraction_prompt(processed_content, card_name_hint, bank_hint)
         
         logger.info(f"Prompt length: {len(prompt)} chars")
         
-        # Call LLM with retry
-        response = await self._call_llm_with_retry(prompt)
+        # Items are built as soon as the streamed response closes each one
+        streamed_items = []
+        
+        def on_item(item_data: Dict[str, Any]) -> None:
+            streamed_items.append((item_data, self._build_intelligence_item(item_data, source_url)))
+        
+        # Call LLM with retry; section storage (if raw_storage is provided)
+        # runs alongside the LLM call instead of delaying it
+        if raw_storage and raw_extraction_id and scored_sections:
+            response, _ = await asyncio.gather(
+                self._call_llm_with_retry(prompt, on_item=on_item),
+                self._store_sections(raw_storage, raw_extraction_id, scored_sections, custom_keywords, source_url),
+            )
+        else:
+            response = await self._call_llm_with_retry(prompt, on_item=on_item)
         
         # Parse response
-        extracted = self._parse_llm_response(response, source_url)
+        extracted = self._parse_llm_response(response, source_url, streamed_items)
         
         return extracted
     
-    async def _call_llm_with_retry(self, prompt: str, max_retries: int = 2) -> str:
-        """Call LLM with retry logic via shared client."""
-        result = await ollama_client.generate(
+    async def extract_intelligence_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Run extract_intelligence for several documents concurrently.
+        
+        Args:
+            jobs: Keyword arguments for extract_intelligence, one dict per document
+            max_concurrency: Maximum extractions in flight (defaults to OLLAMA_NUM_PARALLEL)
+        
+        Returns:
+            Results in the same order as jobs; a failed job yields its exception.
+        """
+        concurrency = max_concurrency or getattr(settings, 'OLLAMA_NUM_PARALLEL', 2)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def _run(job: Dict[str, Any]):
+            async with semaphore:
+                return await self.extract_intelligence(**job)
+        
+        logger.info(f"Starting batch intelligence extraction: {len(jobs)} documents, concurrency {concurrency}")
+        return await asyncio.gather(*(_run(job) for job in jobs), return_exceptions=True)
+    
+    async def _store_sections(
+        self,
+        raw_storage,
+        raw_extraction_id: str,
+        scored_sections: List[Tuple[int, str, bool]],
+        custom_keywords: List[str] = None,
+        source_url: str = None
+    ) -> None:
+        """Analyze scored sections and store them on the raw extraction record."""
+        try:
+            # Prepare section data for storage
+            sections_data = []
+            keywords_to_use = custom_keywords if custom_keywords else self.DEFAULT_KEYWORDS
+            keywords_lower = tuple(kw.lower() for kw in keywords_to_use)
+            for score, section_content, is_selected in scored_sections:
+                # Analyze section for storage
+                section_lower = section_content.lower()
+                keyword_matches = [
+                    {"keyword": keywords_to_use[i], "count": section_lower.count(keywords_lower[i])}
+                    for i in _matched_keywords(section_lower, keywords_lower)
+                ]
+                
+                has_currency, has_percentage, has_numbers = _value_flags(section_lower)
+                
+                sections_data.append({
+                    "content": section_content,
+                    "score": score,
+                    "keyword_matches": keyword_matches,
+                    "keyword_count": len(keyword_matches),
+                    "has_currency": has_currency,
+                    "has_percentage": has_percentage,
+                    "has_numbers": has_numbers,
+                    "is_selected": is_selected
+                })
+            
+            await raw_storage.add_sections(raw_extraction_id, sections_data, source_url)
+            logger.info(f"Stored {len(sections_data)} sections to raw extraction {raw_extraction_id}")
+        except Exception as e:
+            logger.warning(f"Failed to store sections: {e}")
+    
+    async def _call_llm_with_retry(
+        self,
+        prompt: str,
+        max_retries: int = 2,
+        on_item: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> str:
+        """
+        Call LLM with retry logic via shared client, reusing cached responses for identical prompts.
+        
+        When streaming is enabled the response is streamed first and on_item
+        is called with each intelligence item as soon as it is complete; a
+        failed stream falls back to the regular (retrying) call.
+        """
+        cache_key = cache_service.get_llm_cache_key(prompt, f"intelligence:{self.default_model}")
+        cached = await cache_service.get(cache_key)
+        if cached:
+            logger.info("Returning cached LLM response for intelligence extraction")
+            return cached
+        
+        result = None
+        if self.stream_responses:
+            try:
+                result = await self._stream_llm(prompt, on_item)
+            except Exception as e:
+                logger.warning(f"Streaming LLM call failed, falling back to a regular call: {e}")
+        
+        if not result:
+            result = await ollama_client.generate(
+                prompt,
+                num_predict=8000,
+                timeout=self.timeout,
+                max_retries=max_retries,
+                caller="intelligence_extraction",
+            )
+            if result is None:
+                raise Exception("LLM call failed after all retries")
+        
+        # Only cache responses that parse, so a malformed generation is retried
+        # on the next call instead of being replayed for the whole TTL
+        parsed = parse_llm_json(result)
+        if isinstance(parsed, dict) and parsed:
+            await cache_service.set(cache_key, result, cache_service.llm_ttl)
+        return result
+    
+    async def _stream_llm(
+        self,
+        prompt: str,
+        on_item: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> str:
+        """Stream the LLM response, handing completed intelligence items to on_item."""
+        parser = _StreamedItemParser() if on_item else None
+        fragments = []
+        async for fragment in ollama_client.generate_stream(
             prompt,
             num_predict=8000,
             timeout=self.timeout,
-            max_retries=max_retries,
             caller="intelligence_extraction",
-        )
-        if result is None:
-            raise Exception("LLM call failed after all retries")
+        ):
+            fragments.append(fragment)
+            if parser is None:
+                continue
+            for item_data in parser.feed(fragment):
+                try:
+                    on_item(item_data)
+                except Exception as e:
+                    # The item is rebuilt from the full response afterwards
+                    logger.debug("Could not build streamed item: {}", e)
+        
+        result = ''.join(fragments)
+        if parser is not None:
+            logger.info(f"LLM streamed response: {len(result)} chars, {parser.items_seen} items")
         return result
     
     def _build_extraction_prompt(
@@ -431,11 +579,12 @@ Now list ALL benefits from the text above. Return JSON only:"""
     def _parse_llm_response(
         self, 
         response: str, 
-        source_url: str = None
+        source_url: str = None,
+        streamed_items: List[Tuple[Dict[str, Any], Optional[IntelligenceItem]]] = None
     ):  # Returns IntelligenceResult
         """Parse LLM response into intelligence result."""
         
-        logger.info(f"LLM raw response (first 500 chars): {response[:500]}")
+        logger.opt(lazy=True).debug("LLM raw response (first 500 chars): {}", lambda: response[:500])
         
         data = parse_llm_json(response)
         if data is None:
@@ -443,14 +592,21 @@ Now list ALL benefits from the text above. Return JSON only:"""
             data = {}
         
         # Build IntelligenceResult from parsed data
-        return self._build_intelligence_document(data, source_url)
+        return self._build_intelligence_document(data, source_url, streamed_items)
     
     def _build_intelligence_document(
         self, 
         data: Dict, 
-        source_url: str = None
+        source_url: str = None,
+        streamed_items: List[Tuple[Dict[str, Any], Optional[IntelligenceItem]]] = None
     ):  # Returns IntelligenceResult
-        """Build intelligence result from parsed data."""
+        """
+        Build intelligence result from parsed data.
+        
+        streamed_items are (item_data, item) pairs already built while the
+        response streamed in; they are reused when they match the parsed
+        intelligence list exactly.
+        """
         
         # Build card info
         card_data = data.get("card", {})
@@ -501,48 +657,38 @@ Now list ALL benefits from the text above. Return JSON only:"""
         )
         
         # Build intelligence items
-        intelligence_items = []
-        for item_data in data.get("intelligence", []):
-            item = self._build_intelligence_item(item_data, source_url)
-            if item:
-                intelligence_items.append(item)
-        
-        # Build fees
-        fees_data = data.get("fees", {})
-        fees = FeeStructure(
-            annual_fee=self._build_value_spec(fees_data.get("annual_fee")),
-            joining_fee=self._build_value_spec(fees_data.get("joining_fee")),
-            supplementary_card_fee=self._build_value_spec(fees_data.get("supplementary_card_fee")),
-        )
+        raw_items = data.get("intelligence", [])
+        if streamed_items and [item_data for item_data, _ in streamed_items] == raw_items:
+            intelligence_items = [item for _, item in streamed_items if item]
+        else:
+            intelligence_items = []
+            for item_data in raw_items:
+                item = self._build_intelligence_item(item_data, source_url)
+                if item:
+                    intelligence_items.append(item)
         
-        # Build eligibility
-        elig_data = data.get("eligibility", {})
-        eligibility = EligibilityCriteria(
-            minimum_salary=self._build_value_spec(elig_data.get("minimum_salary")),
-            minimum_age=self._build_value_spec(elig_data.get("minimum_age")),
-            maximum_age=self._build_value_spec(elig_data.get("maximum_age")),
-            employment_types=elig_data.get("employment_types", []),
-            required_documents=elig_data.get("documents", []),
-        )
+        # Build fees and eligibility (fresh empty instances when the LLM
+        # returned nothing for them, since documents may be edited later)
+        fees_data = data.get("fees")
+        fees = self._build_fees(fees_data) if fees_data else FeeStructure()
+        
+        elig_data = data.get("eligibility")
+        eligibility = self._build_eligibility(elig_data) if elig_data else EligibilityCriteria()
         
         # Build intelligence index by category
-        intelligence_by_category = {}
+        by_category = defaultdict(list)
         for item in intelligence_items:
-            cat = item.category
-            if cat not in intelligence_by_category:
-                intelligence_by_category[cat] = []
-            intelligence_by_category[cat].append(item.item_id)
+            by_category[item.category].append(item.item_id)
+        intelligence_by_category = dict(by_category)
         
-        # Collect all tags
-        all_tags = list(set(tag for item in intelligence_items for tag in item.tags))
+        # Collect all tags (unique, in first-seen order)
+        all_tags = list(dict.fromkeys(tag for item in intelligence_items for tag in item.tags))
         
-        # Collect all entities
+        # Collect all entities (first occurrence of each type/name wins)
         seen_entities = {}
         for item in intelligence_items:
             for entity in item.entities:
-                key = f"{entity.type}:{entity.name}"
-                if key not in seen_entities:
-                    seen_entities[key] = entity
+                seen_entities.setdefault((entity.type, entity.name), entity)
         all_entities = list(seen_entities.values())
         
         # Create a simple response object (not a Beanie document)
@@ -578,6 +724,24 @@ Now list ALL benefits from the text above. Return JSON only:"""
         
         return result
     
+    def _build_fees(self, fees_data: Dict) -> FeeStructure:
+        """Build the fee structure from the LLM "fees" object."""
+        return FeeStructure(**{
+            field: _build_value_spec(fees_data.get(field))
+            for field in FEE_VALUE_FIELDS
+        })
+    
+    def _build_eligibility(self, elig_data: Dict) -> EligibilityCriteria:
+        """Build eligibility criteria from the LLM "eligibility" object."""
+        return EligibilityCriteria(
+            **{
+                field: _build_value_spec(elig_data.get(field))
+                for field in ELIGIBILITY_VALUE_FIELDS
+            },
+            employment_types=elig_data.get("employment_types", []),
+            required_documents=elig_data.get("documents", []),
+        )
+    
     def _calculate_confidence_simple(self, result) -> float:
         """Calculate confidence score based on extraction quality."""
         score = 0.0
@@ -670,13 +834,12 @@ Now list ALL benefits from the text above. Return JSON only:"""
                 category=entity_data.get("category")
             ))
         
-        # Build value spec
-        value = None
-        if item_data.get("value"):
-            value = self._build_value_spec(item_data["value"])
+        # Build value spec (absent/empty values are the common case)
+        value_data = item_data.get("value")
+        value = _build_value_spec(value_data) if value_data else None
         
         return IntelligenceItem(
-            item_id=str(uuid.uuid4())[:8],
+            item_id=uuid.uuid4().hex[:8],
             title=item_data.get("title", ""),
             description=item_data.get("description", item_data.get("title", "")),
             category=category,
@@ -686,42 +849,213 @@ Now list ALL benefits from the text above. Return JSON only:"""
             entities=entities,
             is_headline=item_data.get("is_headline", False),
             requires_enrollment=item_data.get("requires_enrollment", False),
-            is_conditional=len(conditions) > 0,
+            is_conditional=bool(conditions),
             source=SourceReference(
                 url=source_url,
                 extracted_text=item_data.get("description")
             )
         )
+
+
+def _build_value_spec(value_data: Any) -> Optional[ValueSpec]:
+    """Build a ValueSpec from data."""
     
-    def _build_value_spec(self, value_data: Any) -> Optional[ValueSpec]:
-        """Build a ValueSpec from data."""
-        
-        if value_data is None:
+    if value_data is None:
+        return None
+    
+    builder = VALUE_SPEC_BUILDERS.get(value_data.__class__)
+    if builder is None:
+        return ValueSpec.model_construct(raw_value=str(value_data))
+    return builder(value_data)
+
+
+def _value_spec_from_str(value_data: str) -> ValueSpec:
+    """ValueSpec for a plain string value."""
+    # raw_value is already an exact str and defaults are never validated,
+    # so validation would not change anything here
+    return ValueSpec.model_construct(raw_value=value_data)
+
+
+def _value_spec_from_dict(value_data: Dict[str, Any]) -> ValueSpec:
+    """ValueSpec for a {"raw", "numeric", "type", "currency", "unit"} dict."""
+    numeric = value_data.get("numeric")
+    raw = value_data.get("raw")
+    if raw is None:
+        raw = "" if numeric is None else str(numeric)
+    
+    # Determine value type (LLM output is usually already lowercase)
+    type_str = value_data.get("type")
+    if type_str is None:
+        value_type = ValueType.TEXT
+    else:
+        value_type = VALUE_TYPES.get(type_str)
+        if value_type is None:
+            value_type = VALUE_TYPES.get(type_str.lower(), ValueType.TEXT)
+    
+    return ValueSpec(
+        raw_value=raw,
+        numeric_value=numeric,
+        value_type=value_type,
+        currency=value_data.get("currency"),
+        unit=value_data.get("unit")
+    )
+
+
+# JSON value type -> ValueSpec builder (anything else is stringified)
+VALUE_SPEC_BUILDERS = {
+    str: _value_spec_from_str,
+    dict: _value_spec_from_dict,
+}
+
+
+class _StreamedItemParser:
+    """
+    Incrementally pull complete objects out of the "intelligence" array of a
+    streamed LLM response so they can be built while the model is still
+    generating. Malformed objects are skipped - the full response is always
+    parsed again with parse_llm_json at the end.
+    """
+    
+    ARRAY_START_RE = re.compile(r'"intelligence"\s*:\s*\[')
+    
+    def __init__(self):
+        self.items_seen = 0
+        self._pending = ""  # text not yet searched for the array start
+        self._in_array = False
+        self._done = False
+        self._object_parts: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+    
+    def feed(self, fragment: str) -> List[Dict[str, Any]]:
+        """Consume a response fragment; return the items completed by it."""
+        if self._done:
+            return []
+        if not self._in_array:
+            self._pending += fragment
+            match = self.ARRAY_START_RE.search(self._pending)
+            if not match:
+                # Keep a tail in case the key is split across fragments
+                self._pending = self._pending[-64:]
+                return []
+            self._in_array = True
+            fragment = self._pending[match.end():]
+            self._pending = ""
+        return self._scan(fragment)
+    
+    def _scan(self, text: str) -> List[Dict[str, Any]]:
+        items = []
+        start = 0 if self._depth else None
+        for i, ch in enumerate(text):
+            if self._depth == 0:
+                if ch == '{':
+                    self._depth = 1
+                    start = i
+                elif ch == ']':
+                    self._done = True
+                    break
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '{':
+                self._depth += 1
+            elif ch == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._object_parts.append(text[start:i + 1])
+                    item = self._load(''.join(self._object_parts))
+                    self._object_parts = []
+                    start = None
+                    if item is not None:
+                        items.append(item)
+        if self._depth and start is not None:
+            self._object_parts.append(text[start:])
+        return items
+    
+    def _load(self, text: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError:
             return None
-        
-        if isinstance(value_data, str):
-            return ValueSpec(raw_value=value_data)
-        
-        if isinstance(value_data, dict):
-            raw = value_data.get("raw", str(value_data.get("numeric", "")))
-            
-            # Determine value type
-            type_str = value_data.get("type", "text").lower()
-            try:
-                value_type = ValueType(type_str)
-            except ValueError:
-                value_type = ValueType.TEXT
-            
-            return ValueSpec(
-                raw_value=raw,
-                numeric_value=value_data.get("numeric"),
-                value_type=value_type,
-                currency=value_data.get("currency"),
-                unit=value_data.get("unit")
-            )
-        
-        return ValueSpec(raw_value=str(value_data))
+        if not isinstance(item, dict):
+            return None
+        self.items_seen += 1
+        return item
+
+
+def _iter_segments(text: str, delimiter_re: "re.Pattern", min_length: int = 30) -> Iterator[str]:
+    """
+    Yield the stripped pieces of text between delimiter_re matches.
+    
+    Pieces shorter than min_length are never dropped: a short piece runs on
+    to the next delimiter (keeping the original text between them), and a
+    short final piece is joined to the segment before it. Short lines such
+    as "Annual Fee: AED 500" therefore stay in the content.
+    """
+    start = 0
+    pending = None  # last full-length segment, held back for a short tail
+    pending_start = 0
+    for match in delimiter_re.finditer(text):
+        segment = text[start:match.start()].strip()
+        if len(segment) < min_length:
+            continue  # merge into the following piece
+        if pending is not None:
+            yield pending
+        pending, pending_start = segment, start
+        start = match.end()
+    tail = text[start:].strip()
+    if pending is None:
+        if tail:
+            yield tail
+    elif not tail:
+        yield pending
+    elif len(tail) < min_length:
+        yield text[pending_start:].strip()
+    else:
+        yield pending
+        yield tail
+
+
+def _matched_keywords(text_lower: str, keywords_lower: Tuple[str, ...]) -> List[int]:
+    """Return the (sorted) indexes of keywords_lower that occur in text_lower."""
+    return [i for i, kw in enumerate(keywords_lower) if kw in text_lower]
+
+
+def _value_flags(text_lower: str) -> Tuple[bool, bool, bool]:
+    """
+    Return (has_currency, has_percentage, has_numbers) for lowercased text.
+    
+    A single scan that stops as soon as currency and percentage have both
+    been seen (a percentage implies numbers).
+    """
+    has_currency = has_percentage = has_numbers = False
+    for match in VALUE_FLAGS_RE.finditer(text_lower):
+        if match.group(1):
+            has_currency = True
+        else:
+            has_numbers = True
+            if match.group(2):
+                has_percentage = True
+        if has_currency and has_percentage:
+            break
+    return has_currency, has_percentage, has_numbers
+
+
+# Global instance, created on first use
+_intelligence_extraction_service: Optional[IntelligenceExtractionService] = None
 
 
-# Global instance
-intelligence_extraction_service = IntelligenceExtractionService()
+def get_intelligence_extraction_service() -> IntelligenceExtractionService:
+    """Return the shared IntelligenceExtractionService, creating it on first call."""
+    global _intelligence_extraction_service
+    if _intelligence_extraction_service is None:
+        _intelligence_extraction_service = IntelligenceExtractionService()
+    return _intelligence_extraction_service
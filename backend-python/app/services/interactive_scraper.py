@@ -11,13 +11,383 @@ Handles modern bank websites with expandable/accordion content:
 Designed for Emirates NBD, FAB, ADCB style credit card pages.
 """
 
-import re
+import asyncio
+import importlib.util
 import logging
 from typing import Any, Dict, List, Optional
-from urllib.parse import urljoin
+
+from app.core.config import settings
+from app.services.browser import get_browser
 
 logger = logging.getLogger(__name__)
 
+# Headings that start a section in PHASE 1; navigation waits for the first of them
+SECTION_HEADINGS_SELECTOR = 'main h2, main h3, [role="main"] h2, [role="main"] h3, h2, h3'
+
+# Upper bound on lazy-load scrolling per page
+SCROLL_TIMEOUT_SECONDS = 10
+
+# Requests that add nothing to text/link extraction. Stylesheets are kept: tile
+# detection relies on getBoundingClientRect sizes.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+BLOCKED_TRACKER_HOSTS = (
+    "googletagmanager", "google-analytics", "doubleclick", "hotjar",
+    "facebook.net", "segment.io", "optimizely",
+)
+
+
+# Extraction helpers installed once per browser context (add_init_script), so each
+# page.evaluate only ships the code specific to its step.
+SCRAPE_HELPERS_JS = '''
+window.__scrape = (() => {
+    const BLOCK_TAGS = new Set(['DIV','P','LI','H4','H5','H6','TR','DT','DD','SECTION','ARTICLE','BLOCKQUOTE','FIGCAPTION']);
+    const LIST_TAGS = new Set(['LI','DT','DD']);
+    // Page sections drop page chrome; expanded items keep it (tiles may use header/footer tags)
+    const SECTION_SKIP_TAGS = new Set(['SCRIPT','STYLE','NAV','FOOTER','HEADER','SVG','NOSCRIPT','IFRAME']);
+    const ITEM_SKIP_TAGS = new Set(['SCRIPT','STYLE','NAV','SVG','NOSCRIPT']);
+    
+    // Selectors built once per page: expandable children counted in PHASE 1, items clicked
+    // in PHASE 2, and panels that look expanded after a click
+    const EXPANDABLE_SELECTOR = [
+        '[role="button"]', '[aria-expanded]', '[class*="accordion"]', '[class*="Accordion"]',
+        '[class*="collapse"]', '[class*="expand"]', '[class*="toggle"]', 'details > summary',
+        '[class*="card-click"]', '[class*="clickable"]', '[class*="tile"]', '[class*="Tile"]',
+        '[class*="advantage-item"]', '[class*="feature-item"]', '[class*="benefit-item"]',
+        '[data-toggle]', '[class*="slider-item"]', '[class*="swiper-slide"]',
+    ].join(', ');
+    const CLICKABLE_SELECTOR = [
+        '[role="button"]', '[aria-expanded]',
+        '[class*="accordion"]', '[class*="Accordion"]',
+        '[class*="collapse"]', '[class*="expand"]',
+        '[class*="toggle"]', 'details > summary',
+        '[class*="card-click"]', '[class*="clickable"]',
+        '[class*="tile"]', '[class*="Tile"]',
+        '[class*="advantage"]', '[class*="feature"]',
+        '[class*="benefit"]', '[class*="item"]',
+        '[data-toggle]',
+    ].join(', ');
+    const EXPANDED_PANEL_SELECTOR = [
+        '[aria-expanded="true"]', '[class*="show"]', '[class*="open"]', '[class*="active"]',
+        '[class*="expanded"]', '[style*="display: block"]', '[style*="height: auto"]',
+        'details[open]', '[class*="panel"]:not([hidden])',
+    ].join(', ');
+    
+    const hasBlockChild = (node) => {
+        for (const child of node.children) {
+            if (BLOCK_TAGS.has(child.tagName)) return true;
+        }
+        return false;
+    };
+    
+    // Extract text with line breaks — clean and readable.
+    // Iterative TreeWalker pass in document order (no recursion or per-node arrays).
+    const getTextWithBreaks = (el, skipTags) => {
+        const lines = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT);
+        let depth = 0;
+        
+        for (let node = el; node; ) {
+            let descend = false;
+            if (node.nodeType === 3) {  // Text node
+                const t = node.textContent?.replace(/\\s+/g, ' ').trim();
+                if (t && t.length > 1) lines.push(t);
+            } else if (!skipTags.has(node.tagName)) {
+                if (node.tagName === 'BR') {
+                    lines.push('');  // BR = force line break
+                } else if (BLOCK_TAGS.has(node.tagName) && !hasBlockChild(node)) {
+                    // Leaf block — get its text as one line
+                    const t = node.innerText?.replace(/\\s+/g, ' ').trim();
+                    if (t && t.length > 1) {
+                        const prefix = LIST_TAGS.has(node.tagName) ? '• ' : '';
+                        lines.push(prefix + t);
+                    }
+                } else {
+                    descend = depth < 20;  // Safety limit
+                }
+            }
+            
+            // Advance: into the children, else to the next sibling of the nearest ancestor
+            node = null;
+            if (descend && walker.firstChild()) {
+                depth++;
+                node = walker.currentNode;
+            } else {
+                do {
+                    if (walker.nextSibling()) {
+                        node = walker.currentNode;
+                        break;
+                    }
+                    depth--;
+                } while (walker.parentNode());
+            }
+        }
+        
+        // Clean up: remove duplicate consecutive lines, collapse empty lines
+        const cleaned = [];
+        let prevLine = '';
+        for (const line of lines) {
+            const trimmed = line.trim();
+            if (trimmed === prevLine) continue;  // Skip exact duplicates
+            if (trimmed === '' && (cleaned.length === 0 || cleaned[cleaned.length-1] === '')) continue;  // Collapse empty lines
+            cleaned.push(trimmed);
+            prevLine = trimmed;
+        }
+        
+        return cleaned.join('\\n').replace(/\\n{3,}/g, '\\n\\n').trim();
+    };
+    
+    // Extract links
+    const getLinks = (el, baseUrl) => {
+        const links = [];
+        const seen = new Set();
+        el.querySelectorAll('a[href]').forEach(a => {
+            let href = a.href || a.getAttribute('href');
+            if (!href || href.startsWith('#') || href.startsWith('javascript:') || href.startsWith('mailto:') || href.startsWith('tel:')) return;
+            if (!href.startsWith('http')) href = new URL(href, baseUrl).href;
+            if (!seen.has(href)) {
+                seen.add(href);
+                links.push({url: href, title: a.textContent?.trim() || ''});
+            }
+        });
+        return links;
+    };
+    
+    // First h2/h3 with the given text. The text -> element map is built on demand and
+    // dropped on any DOM change, so headings added or replaced by clicks are picked up.
+    let headingIndex = null;
+    const headingObserver = new MutationObserver(() => { headingIndex = null; });
+    const findHeading = (text) => {
+        if (!headingIndex) {
+            headingIndex = new Map();
+            for (const h of document.querySelectorAll('h2, h3')) {
+                const t = h.textContent?.trim();
+                if (t && !headingIndex.has(t)) headingIndex.set(t, h);
+            }
+            headingObserver.observe(document.body, {childList: true, subtree: true, characterData: true});
+        }
+        return headingIndex.get(text) || null;
+    };
+    
+    // Container holding an expandable section's items
+    const findContainer = (h) => {
+        let container = h.closest('section') || h.closest('[class*="section"]');
+        if (!container) {
+            let parent = h.parentElement;
+            for (let i = 0; i < 5 && parent; i++) {
+                const cls = parent.className?.toLowerCase() || '';
+                if (cls.includes('section') || cls.includes('block') || cls.includes('wrapper') || 
+                    cls.includes('advantage') || cls.includes('benefit') || cls.includes('module') ||
+                    parent.tagName === 'SECTION') {
+                    container = parent;
+                    break;
+                }
+                parent = parent.parentElement;
+            }
+        }
+        return container;
+    };
+    
+    // Resolve once el has stopped mutating for quietMs (expansion finished), or after maxMs
+    const waitForQuiet = (el, quietMs = 150, maxMs = 1200) => new Promise(resolve => {
+        let observer = null;
+        let quietTimer = null;
+        const done = () => {
+            observer.disconnect();
+            clearTimeout(quietTimer);
+            clearTimeout(hardTimer);
+            resolve();
+        };
+        const hardTimer = setTimeout(done, maxMs);
+        observer = new MutationObserver(() => {
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(done, quietMs);
+        });
+        observer.observe(el, {
+            childList: true, subtree: true, characterData: true,
+            attributes: true, attributeFilter: ['class', 'style', 'aria-expanded', 'hidden', 'open'],
+        });
+        quietTimer = setTimeout(done, quietMs);
+    });
+    
+    // Scroll to the bottom until the page height holds for stableChecks polls
+    // (lazy content loaded), then return to the top
+    const scrollToLoad = async (intervalMs = 250, stableChecks = 3, maxSteps = 32) => {
+        const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+        let lastHeight = 0;
+        let stable = 0;
+        for (let step = 0; step < maxSteps && stable < stableChecks; step++) {
+            window.scrollTo(0, document.body.scrollHeight);
+            await sleep(intervalMs);
+            const height = document.body.scrollHeight;
+            if (height === lastHeight) {
+                stable++;
+            } else {
+                stable = 0;
+                lastHeight = height;
+            }
+        }
+        window.scrollTo(0, 0);
+        await sleep(300);
+    };
+    
+    return {SECTION_SKIP_TAGS, ITEM_SKIP_TAGS, EXPANDABLE_SELECTOR, CLICKABLE_SELECTOR, EXPANDED_PANEL_SELECTOR,
+            getTextWithBreaks, getLinks, findHeading, findContainer, waitForQuiet, scrollToLoad};
+})();
+'''
+
+# PHASE 1: every heading with its container text, links and expandable count
+INITIAL_SECTIONS_JS = '''(baseUrl) => {
+    const sections = [];
+    const headings = document.querySelectorAll('main h2, main h3, [role="main"] h2, [role="main"] h3, h2, h3');
+    
+    headings.forEach((h, idx) => {
+        const text = h.textContent?.trim();
+        if (!text || text.length < 3 || text.length > 200) return;
+        
+        // Find section container
+        let container = h.closest('section') || h.closest('[class*="section"]') || h.closest('[class*="block"]');
+        if (!container) {
+            // Walk up to find a reasonable container
+            let parent = h.parentElement;
+            for (let i = 0; i < 5 && parent; i++) {
+                const cls = parent.className?.toLowerCase() || '';
+                const tag = parent.tagName?.toLowerCase();
+                if (tag === 'section' || cls.includes('section') || cls.includes('block') || 
+                    cls.includes('wrapper') || cls.includes('module') || cls.includes('container')) {
+                    container = parent;
+                    break;
+                }
+                parent = parent.parentElement;
+            }
+        }
+        if (!container) container = h.parentElement;
+        
+        // Check for expandable/clickable children
+        const expandables = container ? container.querySelectorAll(window.__scrape.EXPANDABLE_SELECTOR) : [];
+        
+        sections.push({
+            heading: text,
+            content: container ? window.__scrape.getTextWithBreaks(container, window.__scrape.SECTION_SKIP_TAGS) : '',
+            links: container ? window.__scrape.getLinks(container, baseUrl) : [],
+            is_expandable: expandables.length >= 2,
+            expandable_count: expandables.length,
+        });
+    });
+    
+    return sections;
+}'''
+
+# PHASE 2: click each item of one section and capture what it reveals
+EXPAND_SECTION_JS = '''async (args) => {
+    const {sectionHeading, baseUrl} = args;
+    const {
+        getTextWithBreaks, getLinks, findHeading, findContainer, waitForQuiet,
+        ITEM_SKIP_TAGS, CLICKABLE_SELECTOR, EXPANDED_PANEL_SELECTOR,
+    } = window.__scrape;
+    
+    // Find the heading element
+    const targetH = findHeading(sectionHeading);
+    if (!targetH) return {itemCount: 0, subSections: [], error: 'Heading not found'};
+    
+    const container = findContainer(targetH);
+    if (!container) return {itemCount: 0, subSections: [], error: 'Container not found'};
+    
+    // Find clickable items — broad selector covering many patterns
+    let clickables = Array.from(container.querySelectorAll(CLICKABLE_SELECTOR));
+    
+    // Filter to only direct children or near-surface elements (avoid deeply nested)
+    // Also filter out items that are too small to be real tiles
+    clickables = clickables.filter(el => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 50 && rect.height > 20;
+    });
+    
+    // Deduplicate: if a parent and child are both clickable, keep the parent.
+    // One walk up each element's ancestors instead of comparing every pair.
+    const clickableSet = new Set(clickables);
+    const deduped = clickables.filter(el => {
+        for (let parent = el.parentElement; parent; parent = parent.parentElement) {
+            if (clickableSet.has(parent)) return false;
+        }
+        return true;
+    });
+    
+    const subSections = [];
+    for (let itemIndex = 0; itemIndex < deduped.length; itemIndex++) {
+        const clickedEl = deduped[itemIndex];
+        try {
+            // Click (more reliable than Playwright click), then wait until the
+            // container stops changing rather than a fixed animation delay
+            const settled = waitForQuiet(container);
+            clickedEl.click();
+            await settled;
+            
+            // Find newly visible/expanded content
+            // Look for: aria-expanded="true" panels, visible collapse panels, modal/drawer content
+            const expandedPanels = container.querySelectorAll(EXPANDED_PANEL_SELECTOR);
+            
+            // Strategy 1: Content from the clicked element's next sibling or associated panel
+            let contentEl = null;
+            // Check aria-controls
+            const controlsId = clickedEl.getAttribute('aria-controls');
+            if (controlsId) {
+                contentEl = document.getElementById(controlsId);
+            }
+            // Check next sibling
+            if (!contentEl) {
+                contentEl = clickedEl.nextElementSibling;
+            }
+            // Check parent's next sibling
+            if (!contentEl || contentEl.textContent?.trim().length < 20) {
+                contentEl = clickedEl.parentElement?.nextElementSibling;
+            }
+            // Check for expanded panel within parent
+            if (!contentEl || contentEl.textContent?.trim().length < 20) {
+                const parent = clickedEl.closest('[class*="accordion-item"]') || 
+                               clickedEl.closest('[class*="tile"]') ||
+                               clickedEl.parentElement;
+                if (parent) {
+                    const panel = parent.querySelector('[class*="panel"], [class*="content"], [class*="body"], [class*="collapse"]');
+                    if (panel && panel.textContent?.trim().length > 20) {
+                        contentEl = panel;
+                    }
+                }
+            }
+            
+            // Strategy 2: Get the largest newly visible panel
+            if (!contentEl || contentEl.textContent?.trim().length < 20) {
+                let maxLen = 0;
+                for (const panel of expandedPanels) {
+                    const len = panel.textContent?.trim().length || 0;
+                    if (len > maxLen) {
+                        maxLen = len;
+                        contentEl = panel;
+                    }
+                }
+            }
+            
+            if (!contentEl) continue;
+            
+            subSections.push({
+                index: itemIndex,
+                title: clickedEl.querySelector('h3, h4, h5, strong, [class*="title"]')?.textContent?.trim() 
+                       || clickedEl.textContent?.trim().substring(0, 60) || '',
+                content: getTextWithBreaks(contentEl, ITEM_SKIP_TAGS),
+                links: getLinks(contentEl, baseUrl),
+                contentLength: contentEl.textContent?.trim().length || 0,
+            });
+        } catch (e) {
+            subSections.push({
+                index: itemIndex,
+                text: clickedEl.textContent?.trim().substring(0, 60) || '',
+                error: String(e),
+            });
+        }
+    }
+    
+    return {itemCount: deduped.length, subSections: subSections};
+}'''
+
 
 async def scrape_card_page_interactive(url: str, card_name: str = "") -> Dict[str, Any]:
     """
@@ -44,234 +414,136 @@ async def scrape_card_page_interactive(url: str, card_name: str = "") -> Dict[st
         "page_title": str,
     }
     """
-    try:
-        from playwright.async_api import async_playwright
-    except ImportError:
+    # get_browser imports playwright itself; only check that it is available
+    if importlib.util.find_spec("playwright") is None:
         logger.warning("Playwright not installed")
         return {"full_html": "", "sections": [], "page_title": ""}
 
     result = {"full_html": "", "sections": [], "page_title": ""}
 
+    context = None
     try:
-        async with async_playwright() as p:
-            logger.info(f"[Interactive] Launching browser for {url[:80]}...")
-            browser = await p.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu'],
-            )
-            page = await browser.new_page()
-            await page.set_extra_http_headers({
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            })
-
-            # Navigate — use domcontentloaded first (reliable), then try networkidle briefly
-            logger.info(f"[Interactive] Navigating to {url[:80]}...")
-            await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+        logger.info(f"[Interactive] Opening page for {url[:80]}...")
+        browser = await get_browser()
+        context = await browser.new_context(extra_http_headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        })
+        await context.route("**/*", _block_unneeded_requests)
+        await context.add_init_script(SCRAPE_HELPERS_JS)
+        page = await context.new_page()
+
+        await _scrape_with_page(page, url, result)
+    except Exception as e:
+        logger.error(f"[Interactive] Failed for {url[:60]}: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        if context is not None:
             try:
-                await page.wait_for_load_state("networkidle", timeout=10000)
+                await context.close()
             except Exception:
-                pass  # Many bank sites never reach networkidle due to analytics
-
-            # Smart scroll to load lazy content
-            await _smart_scroll(page)
-
-            result["page_title"] = await page.title()
-
-            # ---- PHASE 1: Extract initial page sections ----
-            initial_sections = await page.evaluate('''(baseUrl) => {
-                const sections = [];
-                const headings = document.querySelectorAll('main h2, main h3, [role="main"] h2, [role="main"] h3, h2, h3');
-                
-                headings.forEach((h, idx) => {
-                    const text = h.textContent?.trim();
-                    if (!text || text.length < 3 || text.length > 200) return;
-                    
-                    // Find section container
-                    let container = h.closest('section') || h.closest('[class*="section"]') || h.closest('[class*="block"]');
-                    if (!container) {
-                        // Walk up to find a reasonable container
-                        let parent = h.parentElement;
-                        for (let i = 0; i < 5 && parent; i++) {
-                            const cls = parent.className?.toLowerCase() || '';
-                            const tag = parent.tagName?.toLowerCase();
-                            if (tag === 'section' || cls.includes('section') || cls.includes('block') || 
-                                cls.includes('wrapper') || cls.includes('module') || cls.includes('container')) {
-                                container = parent;
-                                break;
-                            }
-                            parent = parent.parentElement;
-                        }
-                    }
-                    if (!container) container = h.parentElement;
-                    
-                    // Extract text with line breaks — clean and readable
-                    const getTextWithBreaks = (el) => {
-                        const lines = [];
-                        const blockTags = new Set(['DIV','P','LI','H4','H5','H6','TR','DT','DD','SECTION','ARTICLE','BLOCKQUOTE','FIGCAPTION']);
-                        const listTags = new Set(['LI','DT','DD']);
-                        const skipTags = new Set(['SCRIPT','STYLE','NAV','FOOTER','HEADER','SVG','NOSCRIPT','IFRAME']);
-                        
-                        const walk = (node, depth) => {
-                            if (depth > 20) return;  // Safety limit
-                            if (node.nodeType === 3) {  // Text node
-                                const t = node.textContent?.replace(/\\s+/g, ' ').trim();
-                                if (t && t.length > 1) lines.push(t);
-                                return;
-                            }
-                            if (node.nodeType !== 1) return;
-                            if (skipTags.has(node.tagName)) return;
-                            
-                            // BR = force line break
-                            if (node.tagName === 'BR') { lines.push(''); return; }
-                            
-                            // For leaf block elements (no block children), get their text directly
-                            if (blockTags.has(node.tagName)) {
-                                const hasBlockChild = Array.from(node.children).some(c => blockTags.has(c.tagName));
-                                if (!hasBlockChild) {
-                                    // Leaf block — get its text as one line
-                                    const t = node.innerText?.replace(/\\s+/g, ' ').trim();
-                                    if (t && t.length > 1) {
-                                        const prefix = listTags.has(node.tagName) ? '• ' : '';
-                                        lines.push(prefix + t);
-                                    }
-                                    return;
-                                }
-                            }
-                            
-                            // Recurse into children
-                            for (const child of node.childNodes) walk(child, depth + 1);
-                        };
-                        
-                        walk(el, 0);
-                        
-                        // Clean up: remove duplicate consecutive lines, collapse empty lines
-                        const cleaned = [];
-                        let prevLine = '';
-                        for (const line of lines) {
-                            const trimmed = line.trim();
-                            if (trimmed === prevLine) continue;  // Skip exact duplicates
-                            if (trimmed === '' && (cleaned.length === 0 || cleaned[cleaned.length-1] === '')) continue;  // Collapse empty lines
-                            cleaned.push(trimmed);
-                            prevLine = trimmed;
-                        }
-                        
-                        return cleaned.join('\\n').replace(/\\n{3,}/g, '\\n\\n').trim();
-                    };
-                    
-                    // Extract links
-                    const getLinks = (el) => {
-                        const links = [];
-                        const seen = new Set();
-                        el.querySelectorAll('a[href]').forEach(a => {
-                            let href = a.href || a.getAttribute('href');
-                            if (!href || href.startsWith('#') || href.startsWith('javascript:') || href.startsWith('mailto:') || href.startsWith('tel:')) return;
-                            if (!href.startsWith('http')) href = new URL(href, baseUrl).href;
-                            if (!seen.has(href)) {
-                                seen.add(href);
-                                links.push({url: href, title: a.textContent?.trim() || ''});
-                            }
-                        });
-                        return links;
-                    };
-                    
-                    // Check for expandable/clickable children
-                    const expandables = container ? container.querySelectorAll(
-                        '[role="button"], [aria-expanded], [class*="accordion"], [class*="Accordion"], ' +
-                        '[class*="collapse"], [class*="expand"], [class*="toggle"], details > summary, ' +
-                        '[class*="card-click"], [class*="clickable"], [class*="tile"], [class*="Tile"], ' +
-                        '[class*="advantage-item"], [class*="feature-item"], [class*="benefit-item"], ' +
-                        '[data-toggle], [class*="slider-item"], [class*="swiper-slide"]'
-                    ) : [];
-                    
-                    sections.push({
-                        heading: text,
-                        content: container ? getTextWithBreaks(container) : '',
-                        links: container ? getLinks(container) : [],
-                        is_expandable: expandables.length >= 2,
-                        expandable_count: expandables.length,
-                        container_selector: container ? _buildSelector(container) : null,
-                    });
-                });
-                
-                // Helper to build a CSS selector for an element
-                function _buildSelector(el) {
-                    if (el.id) return '#' + el.id;
-                    let path = el.tagName.toLowerCase();
-                    if (el.className) {
-                        const cls = el.className.split(' ').filter(c => c && !c.includes('active') && !c.includes('open')).slice(0, 2).join('.');
-                        if (cls) path += '.' + cls;
-                    }
-                    // Add nth-child for uniqueness
-                    if (el.parentElement) {
-                        const siblings = Array.from(el.parentElement.children).filter(s => s.tagName === el.tagName);
-                        if (siblings.length > 1) {
-                            const idx = siblings.indexOf(el) + 1;
-                            path += ':nth-of-type(' + idx + ')';
-                        }
-                    }
-                    return path;
-                }
-                
-                return sections;
-            }''', url)
-
-            logger.info(f"[Interactive] Found {len(initial_sections)} sections, "
-                        f"{sum(1 for s in initial_sections if s.get('is_expandable'))} expandable")
-
-            # ---- PHASE 2: Click expandable sections to reveal hidden content ----
-            for section in initial_sections:
-                if not section.get('is_expandable'):
-                    result["sections"].append({
-                        "heading": section["heading"],
-                        "content": section.get("content", ""),
-                        "links": section.get("links", []),
-                        "is_expandable": False,
-                        "sub_sections": [],
-                    })
-                    continue
-
-                logger.info(f"[Interactive] Expanding '{section['heading'][:50]}' ({section['expandable_count']} items)")
-
-                # Click each expandable item and capture content
-                sub_sections = await _expand_section_items(page, section, url)
-
-                result["sections"].append({
-                    "heading": section["heading"],
-                    "content": section.get("content", ""),
-                    "links": section.get("links", []),
-                    "is_expandable": True,
-                    "sub_sections": sub_sections,
-                })
+                pass
 
-            # ---- PHASE 3: Get final full HTML after all expansions ----
-            result["full_html"] = await page.content()
+    return result
 
-            await browser.close()
 
-            total_subs = sum(len(s.get("sub_sections", [])) for s in result["sections"])
-            logger.info(f"[Interactive] Complete: {len(result['sections'])} sections, {total_subs} sub-sections from {url[:60]}")
+async def scrape_card_pages_interactive(
+    urls: List[str],
+    card_names: Optional[List[str]] = None,
+    max_concurrency: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Scrape several card pages concurrently on the shared browser.
+    
+    At most max_concurrency (default SCRAPER_INTERACTIVE_CONCURRENCY) pages
+    are open at once. Results are returned in the order of urls; a page that
+    fails yields the same empty result as scrape_card_page_interactive.
+    """
+    concurrency = max_concurrency or getattr(settings, 'SCRAPER_INTERACTIVE_CONCURRENCY', 4)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    names = card_names or [""] * len(urls)
 
-    except Exception as e:
-        logger.error(f"[Interactive] Failed for {url[:60]}: {e}")
-        import traceback
-        traceback.print_exc()
+    async def _scrape_one(url: str, card_name: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await scrape_card_page_interactive(url, card_name)
+
+    return await asyncio.gather(*(
+        _scrape_one(url, card_name) for url, card_name in zip(urls, names)
+    ))
 
-    return result
+
+async def _scrape_with_page(page, url: str, result: Dict[str, Any]) -> None:
+    """Load url in page and fill result in place (partial results survive errors)."""
+    # Navigate — use domcontentloaded, then wait only until the headings we extract exist
+    # (many bank sites never reach networkidle due to analytics)
+    logger.info(f"[Interactive] Navigating to {url[:80]}...")
+    await page.goto(url, wait_until="domcontentloaded", timeout=45000)
+    try:
+        await page.wait_for_selector(SECTION_HEADINGS_SELECTOR, timeout=8000)
+    except Exception:
+        pass  # No headings yet — extract whatever rendered
+
+    # Smart scroll to load lazy content
+    await _smart_scroll(page)
+
+    result["page_title"] = await page.title()
+
+    # ---- PHASE 1: Extract initial page sections ----
+    initial_sections = await page.evaluate(INITIAL_SECTIONS_JS, url)
+
+    logger.info(f"[Interactive] Found {len(initial_sections)} sections, "
+                f"{sum(1 for s in initial_sections if s.get('is_expandable'))} expandable")
+
+    # ---- PHASE 2: Click expandable sections to reveal hidden content ----
+    for section in initial_sections:
+        if not section.get('is_expandable'):
+            result["sections"].append({
+                "heading": section["heading"],
+                "content": section.get("content", ""),
+                "links": section.get("links", []),
+                "is_expandable": False,
+                "sub_sections": [],
+            })
+            continue
+
+        logger.info(f"[Interactive] Expanding '{section['heading'][:50]}' ({section['expandable_count']} items)")
+
+        # Click each expandable item and capture content
+        sub_sections = await _expand_section_items(page, section, url)
+
+        result["sections"].append({
+            "heading": section["heading"],
+            "content": section.get("content", ""),
+            "links": section.get("links", []),
+            "is_expandable": True,
+            "sub_sections": sub_sections,
+        })
+
+    # ---- PHASE 3: Get final full HTML after all expansions ----
+    result["full_html"] = await page.content()
+
+    total_subs = sum(len(s.get("sub_sections", [])) for s in result["sections"])
+    logger.info(f"[Interactive] Complete: {len(result['sections'])} sections, {total_subs} sub-sections from {url[:60]}")
+
+
+async def _block_unneeded_requests(route) -> None:
+    """Abort images, fonts, media and tracker requests; let everything else through."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host in request.url for host in BLOCKED_TRACKER_HOSTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 async def _smart_scroll(page) -> None:
     """Scroll the page to trigger lazy loading — optimized for Docker."""
     try:
-        last_height = 0
-        for i in range(8):
-            current_height = await page.evaluate("document.body.scrollHeight")
-            if current_height == last_height:
-                break
-            last_height = current_height
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await page.wait_for_timeout(800)
-        await page.evaluate("window.scrollTo(0, 0)")
-        await page.wait_for_timeout(300)
+        # One in-page loop (stops once the height settles) instead of a round-trip per step
+        await asyncio.wait_for(page.evaluate("window.__scrape.scrollToLoad()"), timeout=SCROLL_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning(f"[Interactive] Scroll did not settle within {SCROLL_TIMEOUT_SECONDS}s")
     except Exception as e:
         logger.warning(f"[Interactive] Scroll error: {e}")
 
@@ -280,353 +552,34 @@ async def _expand_section_items(page, section: Dict, base_url: str) -> List[Dict
     """
     Find and click expandable items within a section container.
     After each click, capture the revealed content and links.
+
+    The whole click-and-capture loop runs inside the page in a single
+    evaluate, so a section costs one round-trip instead of two per item.
     """
     sub_sections = []
 
     try:
-        # Use JS to find all clickable items in the section and click them one by one
-        expandable_data = await page.evaluate('''(sectionHeading) => {
-            // Find the heading element
-            const headings = document.querySelectorAll('h2, h3');
-            let targetH = null;
-            for (const h of headings) {
-                if (h.textContent?.trim() === sectionHeading) {
-                    targetH = h;
-                    break;
-                }
-            }
-            if (!targetH) return {items: [], error: 'Heading not found'};
-            
-            // Find container
-            let container = targetH.closest('section') || targetH.closest('[class*="section"]');
-            if (!container) {
-                let parent = targetH.parentElement;
-                for (let i = 0; i < 5 && parent; i++) {
-                    const cls = parent.className?.toLowerCase() || '';
-                    if (cls.includes('section') || cls.includes('block') || cls.includes('wrapper') || 
-                        cls.includes('advantage') || cls.includes('benefit') || cls.includes('module') ||
-                        parent.tagName === 'SECTION') {
-                        container = parent;
-                        break;
-                    }
-                    parent = parent.parentElement;
-                }
-            }
-            if (!container) return {items: [], error: 'Container not found'};
-            
-            // Find clickable items — broad selector covering many patterns
-            const clickSelectors = [
-                '[role="button"]', '[aria-expanded]',
-                '[class*="accordion"]', '[class*="Accordion"]',
-                '[class*="collapse"]', '[class*="expand"]',
-                '[class*="toggle"]', 'details > summary',
-                '[class*="card-click"]', '[class*="clickable"]',
-                '[class*="tile"]', '[class*="Tile"]',
-                '[class*="advantage"]', '[class*="feature"]',
-                '[class*="benefit"]', '[class*="item"]',
-                '[data-toggle]',
-            ].join(', ');
-            
-            let clickables = Array.from(container.querySelectorAll(clickSelectors));
-            
-            // Filter to only direct children or near-surface elements (avoid deeply nested)
-            // Also filter out items that are too small to be real tiles
-            clickables = clickables.filter(el => {
-                const rect = el.getBoundingClientRect();
-                return rect.width > 50 && rect.height > 20;
-            });
-            
-            // Deduplicate: if a parent and child are both clickable, keep the parent
-            const deduped = [];
-            for (const el of clickables) {
-                const isChild = clickables.some(other => other !== el && other.contains(el));
-                if (!isChild) deduped.push(el);
-            }
-            
-            return {
-                items: deduped.map((el, i) => ({
-                    index: i,
-                    tag: el.tagName,
-                    class: el.className?.substring(0, 80),
-                    text: el.textContent?.trim().substring(0, 60),
-                    ariaExpanded: el.getAttribute('aria-expanded'),
-                    rect: el.getBoundingClientRect(),
-                })),
-                containerTag: container.tagName,
-                containerClass: container.className?.substring(0, 80),
-            };
-        }''', section["heading"])
-
-        items = expandable_data.get("items", [])
-        if not items:
+        expanded = await page.evaluate(EXPAND_SECTION_JS, {"sectionHeading": section["heading"], "baseUrl": base_url})
+
+        item_count = expanded.get("itemCount", 0)
+        if not item_count:
             logger.info(f"[Interactive] No clickable items found for '{section['heading'][:40]}'")
             return sub_sections
 
-        logger.info(f"[Interactive] Found {len(items)} clickable items in '{section['heading'][:40]}'")
-
-        # Click each item and capture the revealed content
-        for item in items:
-            try:
-                sub = await _click_and_capture(page, section["heading"], item, base_url)
-                if sub and sub.get("content"):
-                    sub_sections.append(sub)
-            except Exception as e:
-                logger.warning(f"[Interactive] Click failed for item '{item.get('text', '')[:30]}': {e}")
+        logger.info(f"[Interactive] Found {item_count} clickable items in '{section['heading'][:40]}'")
+
+        for sub in expanded.get("subSections", []):
+            if sub.get("error"):
+                logger.warning(f"[Interactive] Click+capture failed for item '{sub.get('text', '')[:30]}': {sub['error']}")
+            elif sub.get("content"):
+                logger.info(f"[Interactive]   Item {sub['index']}: '{sub.get('title', '')[:40]}' → {sub.get('contentLength', 0)} chars, {len(sub.get('links', []))} links")
+                sub_sections.append({
+                    "title": sub.get("title", ""),
+                    "content": sub["content"],
+                    "links": sub.get("links", []),
+                })
 
     except Exception as e:
         logger.error(f"[Interactive] Expand error for '{section['heading'][:40]}': {e}")
 
     return sub_sections
-
-
-async def _click_and_capture(page, section_heading: str, item: Dict, base_url: str) -> Optional[Dict]:
-    """Click a single expandable item and capture the revealed content."""
-    item_text = item.get("text", "")
-    item_index = item.get("index", 0)
-
-    try:
-        # Click the item using JS (more reliable than Playwright click)
-        click_result = await page.evaluate('''(args) => {
-            const {sectionHeading, itemIndex} = args;
-            
-            // Re-find the container and clickable items
-            const headings = document.querySelectorAll('h2, h3');
-            let container = null;
-            for (const h of headings) {
-                if (h.textContent?.trim() === sectionHeading) {
-                    container = h.closest('section') || h.closest('[class*="section"]');
-                    if (!container) {
-                        let parent = h.parentElement;
-                        for (let i = 0; i < 5 && parent; i++) {
-                            const cls = parent.className?.toLowerCase() || '';
-                            if (cls.includes('section') || cls.includes('block') || cls.includes('wrapper') || 
-                                cls.includes('advantage') || cls.includes('benefit') || cls.includes('module') ||
-                                parent.tagName === 'SECTION') {
-                                container = parent;
-                                break;
-                            }
-                            parent = parent.parentElement;
-                        }
-                    }
-                    break;
-                }
-            }
-            if (!container) return {error: 'Container not found'};
-            
-            const clickSelectors = [
-                '[role="button"]', '[aria-expanded]',
-                '[class*="accordion"]', '[class*="Accordion"]',
-                '[class*="collapse"]', '[class*="expand"]',
-                '[class*="toggle"]', 'details > summary',
-                '[class*="card-click"]', '[class*="clickable"]',
-                '[class*="tile"]', '[class*="Tile"]',
-                '[class*="advantage"]', '[class*="feature"]',
-                '[class*="benefit"]', '[class*="item"]',
-                '[data-toggle]',
-            ].join(', ');
-            
-            let clickables = Array.from(container.querySelectorAll(clickSelectors))
-                .filter(el => {
-                    const rect = el.getBoundingClientRect();
-                    return rect.width > 50 && rect.height > 20;
-                });
-            const deduped = clickables.filter(el => !clickables.some(o => o !== el && o.contains(el)));
-            
-            if (itemIndex >= deduped.length) return {error: 'Item index out of range'};
-            
-            const target = deduped[itemIndex];
-            
-            // Get content BEFORE click for comparison
-            const beforeHTML = container.innerHTML.length;
-            
-            // Click
-            target.click();
-            
-            return {
-                clicked: true,
-                targetText: target.textContent?.trim().substring(0, 60),
-                beforeHTML: beforeHTML,
-            };
-        }''', {"sectionHeading": section_heading, "itemIndex": item_index})
-
-        if click_result.get("error"):
-            return None
-
-        # Wait for expansion animation
-        await page.wait_for_timeout(800)
-
-        # Now capture the expanded content
-        expanded = await page.evaluate('''(args) => {
-            const {sectionHeading, itemIndex} = args;
-            
-            const headings = document.querySelectorAll('h2, h3');
-            let container = null;
-            for (const h of headings) {
-                if (h.textContent?.trim() === sectionHeading) {
-                    container = h.closest('section') || h.closest('[class*="section"]');
-                    if (!container) {
-                        let parent = h.parentElement;
-                        for (let i = 0; i < 5 && parent; i++) {
-                            const cls = parent.className?.toLowerCase() || '';
-                            if (cls.includes('section') || cls.includes('block') || cls.includes('wrapper') || 
-                                cls.includes('advantage') || cls.includes('benefit') || cls.includes('module') ||
-                                parent.tagName === 'SECTION') {
-                                container = parent;
-                                break;
-                            }
-                            parent = parent.parentElement;
-                        }
-                    }
-                    break;
-                }
-            }
-            if (!container) return null;
-            
-            // Find newly visible/expanded content
-            // Look for: aria-expanded="true" panels, visible collapse panels, modal/drawer content
-            const expandedPanels = container.querySelectorAll(
-                '[aria-expanded="true"], [class*="show"], [class*="open"], [class*="active"], ' +
-                '[class*="expanded"], [style*="display: block"], [style*="height: auto"], ' +
-                'details[open], [class*="panel"]:not([hidden])'
-            );
-            
-            // Also look for any newly visible content near the clicked item
-            const clickSelectors = [
-                '[role="button"]', '[aria-expanded]',
-                '[class*="accordion"]', '[class*="tile"]',
-                '[class*="advantage"]', '[class*="feature"]',
-                '[class*="benefit"]', '[class*="item"]',
-                '[data-toggle]',
-            ].join(', ');
-            
-            let clickables = Array.from(container.querySelectorAll(clickSelectors))
-                .filter(el => el.getBoundingClientRect().width > 50 && el.getBoundingClientRect().height > 20);
-            const deduped = clickables.filter(el => !clickables.some(o => o !== el && o.contains(el)));
-            
-            const clickedEl = deduped[itemIndex];
-            
-            // Collect content from the clicked item's expanded area
-            const getTextWithBreaks = (el) => {
-                const lines = [];
-                const blockTags = new Set(['DIV','P','LI','H4','H5','H6','TR','DT','DD','SECTION','ARTICLE','BLOCKQUOTE','FIGCAPTION']);
-                const listTags = new Set(['LI','DT','DD']);
-                const skipTags = new Set(['SCRIPT','STYLE','NAV','SVG','NOSCRIPT']);
-                
-                const walk = (node, depth) => {
-                    if (depth > 20) return;
-                    if (node.nodeType === 3) {
-                        const t = node.textContent?.replace(/\\s+/g, ' ').trim();
-                        if (t && t.length > 1) lines.push(t);
-                        return;
-                    }
-                    if (node.nodeType !== 1) return;
-                    if (skipTags.has(node.tagName)) return;
-                    if (node.tagName === 'BR') { lines.push(''); return; }
-                    
-                    if (blockTags.has(node.tagName)) {
-                        const hasBlockChild = Array.from(node.children).some(c => blockTags.has(c.tagName));
-                        if (!hasBlockChild) {
-                            const t = node.innerText?.replace(/\\s+/g, ' ').trim();
-                            if (t && t.length > 1) {
-                                const prefix = listTags.has(node.tagName) ? '• ' : '';
-                                lines.push(prefix + t);
-                            }
-                            return;
-                        }
-                    }
-                    for (const child of node.childNodes) walk(child, depth + 1);
-                };
-                
-                walk(el, 0);
-                
-                const cleaned = [];
-                let prevLine = '';
-                for (const line of lines) {
-                    const trimmed = line.trim();
-                    if (trimmed === prevLine) continue;
-                    if (trimmed === '' && (cleaned.length === 0 || cleaned[cleaned.length-1] === '')) continue;
-                    cleaned.push(trimmed);
-                    prevLine = trimmed;
-                }
-                return cleaned.join('\\n').replace(/\\n{3,}/g, '\\n\\n').trim();
-            };
-            
-            const getLinks = (el) => {
-                const links = [];
-                const seen = new Set();
-                el.querySelectorAll('a[href]').forEach(a => {
-                    let href = a.href || a.getAttribute('href');
-                    if (!href || href.startsWith('#') || href.startsWith('javascript:') || href.startsWith('mailto:')) return;
-                    if (!seen.has(href)) {
-                        seen.add(href);
-                        links.push({url: href, title: a.textContent?.trim() || ''});
-                    }
-                });
-                return links;
-            };
-            
-            // Strategy 1: Content from the clicked element's next sibling or associated panel
-            let contentEl = null;
-            if (clickedEl) {
-                // Check aria-controls
-                const controlsId = clickedEl.getAttribute('aria-controls');
-                if (controlsId) {
-                    contentEl = document.getElementById(controlsId);
-                }
-                // Check next sibling
-                if (!contentEl) {
-                    contentEl = clickedEl.nextElementSibling;
-                }
-                // Check parent's next sibling
-                if (!contentEl || contentEl.textContent?.trim().length < 20) {
-                    contentEl = clickedEl.parentElement?.nextElementSibling;
-                }
-                // Check for expanded panel within parent
-                if (!contentEl || contentEl.textContent?.trim().length < 20) {
-                    const parent = clickedEl.closest('[class*="accordion-item"]') || 
-                                   clickedEl.closest('[class*="tile"]') ||
-                                   clickedEl.parentElement;
-                    if (parent) {
-                        const panel = parent.querySelector('[class*="panel"], [class*="content"], [class*="body"], [class*="collapse"]');
-                        if (panel && panel.textContent?.trim().length > 20) {
-                            contentEl = panel;
-                        }
-                    }
-                }
-            }
-            
-            // Strategy 2: Get the largest newly visible panel
-            if (!contentEl || contentEl.textContent?.trim().length < 20) {
-                let maxLen = 0;
-                for (const panel of expandedPanels) {
-                    const len = panel.textContent?.trim().length || 0;
-                    if (len > maxLen) {
-                        maxLen = len;
-                        contentEl = panel;
-                    }
-                }
-            }
-            
-            if (!contentEl) return null;
-            
-            return {
-                title: clickedEl?.querySelector('h3, h4, h5, strong, [class*="title"]')?.textContent?.trim() 
-                       || clickedEl?.textContent?.trim().substring(0, 60) || '',
-                content: getTextWithBreaks(contentEl),
-                links: getLinks(contentEl),
-                contentLength: contentEl.textContent?.trim().length || 0,
-            };
-        }''', {"sectionHeading": section_heading, "itemIndex": item_index})
-
-        if expanded and expanded.get("content"):
-            logger.info(f"[Interactive]   Item {item_index}: '{expanded.get('title', '')[:40]}' → {expanded.get('contentLength', 0)} chars, {len(expanded.get('links', []))} links")
-            return {
-                "title": expanded.get("title", item_text[:60]),
-                "content": expanded["content"],
-                "links": expanded.get("links", []),
-            }
-
-    except Exception as e:
-        logger.warning(f"[Interactive] Click+capture failed for item {item_index}: {e}")
-
-    return None
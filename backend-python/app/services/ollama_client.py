@@ -10,6 +10,7 @@ implementations that existed in:
 Features:
   - Configurable per-call model, temperature, num_predict, num_ctx
   - Retry with exponential backoff
+  - Streaming responses (generate_stream)
   - Concurrency control via asyncio.Semaphore
   - Structured logging (no print statements)
 """
@@ -17,7 +18,7 @@ Features:
 import asyncio
 import json
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 
 import httpx
 
@@ -47,7 +48,8 @@ class OllamaClient:
     @classmethod
     def get_semaphore(cls) -> asyncio.Semaphore:
         if cls._semaphore is None:
-            cls._semaphore = asyncio.Semaphore(cls._max_concurrent)
+            max_concurrent = getattr(settings, "OLLAMA_NUM_PARALLEL", cls._max_concurrent)
+            cls._semaphore = asyncio.Semaphore(max(1, max_concurrent))
         return cls._semaphore
 
     # ------------------------------------------------------------------
@@ -93,20 +95,7 @@ class OllamaClient:
 
         endpoint = f"{self.base_url}/api/generate"
         prefix = f"[{caller}] " if caller else ""
-
-        payload: Dict[str, Any] = {
-            "model": model,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": num_predict,
-            },
-        }
-        if num_ctx:
-            payload["options"]["num_ctx"] = num_ctx
-        if format:
-            payload["format"] = format
+        payload = self._build_payload(prompt, model, temperature, num_predict, num_ctx, format, stream=False)
 
         async def _do_call() -> Optional[str]:
             last_error: Optional[Exception] = None
@@ -151,6 +140,91 @@ class OllamaClient:
         else:
             return await _do_call()
 
+    # ------------------------------------------------------------------
+    # Streaming generate call
+    # ------------------------------------------------------------------
+    async def generate_stream(
+        self,
+        prompt: str,
+        *,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        num_predict: Optional[int] = None,
+        num_ctx: Optional[int] = None,
+        timeout: Optional[float] = None,
+        use_semaphore: bool = True,
+        caller: str = "",
+        format: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Send a prompt to Ollama with streaming enabled and yield response text
+        fragments as the model produces them.
+
+        Unlike generate(), there are no retries (a partially consumed stream
+        cannot be replayed); errors propagate to the caller. The timeout
+        applies to each read, not the whole generation.
+        """
+        model = model or self.default_model
+        temperature = temperature if temperature is not None else self.default_temperature
+        num_predict = num_predict or self.default_num_predict
+        timeout = timeout or self.default_timeout
+
+        endpoint = f"{self.base_url}/api/generate"
+        prefix = f"[{caller}] " if caller else ""
+        payload = self._build_payload(prompt, model, temperature, num_predict, num_ctx, format, stream=True)
+
+        semaphore = self.get_semaphore() if use_semaphore else None
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            logger.info(f"{prefix}LLM streaming call model={model} prompt={len(prompt)} chars")
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                async with client.stream("POST", endpoint, json=payload) as resp:
+                    if resp.status_code != 200:
+                        body = await resp.aread()
+                        logger.error(f"{prefix}Ollama HTTP {resp.status_code}: {body[:500]!r}")
+                        resp.raise_for_status()
+                    async for line in resp.aiter_lines():
+                        if not line:
+                            continue
+                        data = json.loads(line)
+                        if data.get("error"):
+                            raise ValueError(f"Ollama error: {data['error']}")
+                        fragment = data.get("response", "")
+                        if fragment:
+                            yield fragment
+                        if data.get("done"):
+                            break
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    @staticmethod
+    def _build_payload(
+        prompt: str,
+        model: str,
+        temperature: float,
+        num_predict: int,
+        num_ctx: Optional[int],
+        format: Optional[str],
+        stream: bool,
+    ) -> Dict[str, Any]:
+        """Build the /api/generate request body."""
+        payload: Dict[str, Any] = {
+            "model": model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+                "num_predict": num_predict,
+            },
+        }
+        if num_ctx:
+            payload["options"]["num_ctx"] = num_ctx
+        if format:
+            payload["format"] = format
+        return payload
+
     # ------------------------------------------------------------------
     # Generate + JSON parse convenience
     # ------------------------------------------------------------------
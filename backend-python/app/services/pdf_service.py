@@ -7,7 +7,11 @@ Uses multiple extraction methods for robust PDF text extraction:
 4. OCR with pytesseract - For scanned/image-based PDFs
 """
 from typing import Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
 import io
+import multiprocessing
 import re
 import httpx
 
@@ -22,13 +26,52 @@ class PDFService:
     def __init__(self):
         self.max_size_bytes = settings.get_pdf_max_size_bytes()
         self.timeout = 60  # Increased timeout for large PDFs
-
-    async def extract_text_from_url(self, pdf_url: str) -> str:
+        self._client: Optional[httpx.AsyncClient] = None
+        self.max_workers = max(settings.PDF_MAX_WORKERS, 1)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=50),
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                },
+            )
+        return self._client
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Return the worker pool used for CPU-bound PDF parsing.
+
+        Workers are spawned rather than forked so they do not inherit the
+        server's event loop, database and Redis clients.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    async def aclose(self) -> None:
+        """Close pooled connections and stop PDF worker processes."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def extract_text_from_url(self, pdf_url: str, max_chars: Optional[int] = None) -> str:
         """
         Download and extract text from a PDF URL.
 
         Args:
             pdf_url: URL to the PDF file.
+            max_chars: Stop reading further pages once this much text is collected.
 
         Returns:
             Extracted text content.
@@ -39,25 +82,21 @@ class PDFService:
         try:
             logger.info(f"Downloading PDF from: {pdf_url}")
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    pdf_url, 
-                    follow_redirects=True,
-                    headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
-                )
-                response.raise_for_status()
-                
-                # Check content type
-                content_type = response.headers.get('content-type', '')
-                if 'pdf' not in content_type.lower() and not pdf_url.lower().endswith('.pdf'):
-                    logger.warning(f"URL may not be a PDF: content-type={content_type}")
-                
-                pdf_content = response.content
-                logger.info(f"Downloaded PDF: {len(pdf_content)} bytes")
-                
-                return await self.extract_text_from_pdf(pdf_content, source_url=pdf_url)
+            client = await self._get_client()
+            response = await client.get(pdf_url)
+            response.raise_for_status()
+            
+            # Check content type
+            content_type = response.headers.get('content-type', '')
+            if 'pdf' not in content_type.lower() and not pdf_url.lower().endswith('.pdf'):
+                logger.warning(f"URL may not be a PDF: content-type={content_type}")
+            
+            pdf_content = response.content
+            logger.info(f"Downloaded PDF: {len(pdf_content)} bytes")
+            
+            return await self.extract_text_from_pdf(
+                pdf_content, source_url=pdf_url, max_chars=max_chars
+            )
                 
         except httpx.HTTPError as e:
             logger.error(f"Failed to download PDF from {pdf_url}: {str(e)}")
@@ -66,13 +105,19 @@ class PDFService:
             logger.error(f"PDF URL processing error: {str(e)}")
             raise PDFProcessingError(f"Failed to process PDF from URL: {str(e)}")
 
-    async def extract_text_from_pdf(self, pdf_content: bytes, source_url: str = None) -> str:
+    async def extract_text_from_pdf(
+        self,
+        pdf_content: bytes,
+        source_url: str = None,
+        max_chars: Optional[int] = None
+    ) -> str:
         """
         Extract text from PDF file using multiple methods.
 
         Args:
             pdf_content: PDF file content as bytes.
             source_url: Source URL for logging purposes.
+            max_chars: Stop reading further pages once this much text is collected.
 
         Returns:
             Extracted text content.
@@ -80,19 +125,38 @@ class PDFService:
         Raises:
             PDFProcessingError: If PDF processing fails.
         """
+        # Check file size
+        if len(pdf_content) > self.max_size_bytes:
+            raise PDFProcessingError(
+                f"PDF file too large (maximum {settings.PDF_MAX_SIZE_MB}MB)"
+            )
+
+        logger.info(f"Processing PDF of size: {len(pdf_content)} bytes")
+
+        # Parsing is CPU-bound; run it in a worker process so the event loop
+        # stays free and several PDFs can be parsed in parallel
+        loop = asyncio.get_running_loop()
         try:
-            # Check file size
-            if len(pdf_content) > self.max_size_bytes:
-                raise PDFProcessingError(
-                    f"PDF file too large (maximum {settings.PDF_MAX_SIZE_MB}MB)"
-                )
+            return await loop.run_in_executor(
+                self._get_pool(), _extract_text_worker, pdf_content, max_chars
+            )
+        except BrokenProcessPool:
+            logger.warning("PDF worker pool broke, parsing in a thread instead")
+            self._pool = None
+            return await asyncio.to_thread(self._extract_text_sync, pdf_content, max_chars)
+
+    def _extract_text_sync(self, pdf_content: bytes, max_chars: Optional[int] = None) -> str:
+        """
+        Run the extraction methods in order and return the best text.
 
-            logger.info(f"Processing PDF of size: {len(pdf_content)} bytes")
-            
+        Raises:
+            PDFProcessingError: If PDF processing fails.
+        """
+        try:
             extraction_results = []
             
             # Method 1: Try pdfplumber FIRST - most reliable, handles tables well
-            text_plumber = self._extract_with_pdfplumber(pdf_content)
+            text_plumber = self._extract_with_pdfplumber(pdf_content, max_chars)
             if text_plumber:
                 quality = self._assess_text_quality(text_plumber)
                 extraction_results.append(('pdfplumber', text_plumber, quality))
@@ -105,14 +169,14 @@ class PDFService:
                     return cleaned_text.strip()
 
             # Method 2: Try pymupdf (fitz) - best for complex fonts and layouts
-            text_fitz = self._extract_with_pymupdf(pdf_content)
+            text_fitz = self._extract_with_pymupdf(pdf_content, max_chars)
             if text_fitz:
                 quality = self._assess_text_quality(text_fitz)
                 extraction_results.append(('pymupdf', text_fitz, quality))
                 logger.info(f"pymupdf extracted {len(text_fitz)} chars, quality: {quality}")
 
             # Method 3: Try PyPDF2 - fallback
-            text_pypdf2 = self._extract_with_pypdf2(pdf_content)
+            text_pypdf2 = self._extract_with_pypdf2(pdf_content, max_chars)
             if text_pypdf2:
                 quality = self._assess_text_quality(text_pypdf2)
                 extraction_results.append(('PyPDF2', text_pypdf2, quality))
@@ -131,7 +195,7 @@ class PDFService:
                 # If quality is still poor, try OCR
                 if best_quality < 0.3 and len(cleaned_text) < 500:
                     logger.info("Text quality poor, attempting OCR...")
-                    ocr_text = self._extract_with_ocr(pdf_content)
+                    ocr_text = self._extract_with_ocr(pdf_content, max_chars)
                     if ocr_text and self._assess_text_quality(ocr_text) > best_quality:
                         cleaned_text = self._clean_extracted_text(ocr_text)
                         logger.info(f"OCR produced better results: {len(cleaned_text)} chars")
@@ -142,7 +206,7 @@ class PDFService:
 
             # If all methods failed, try OCR as last resort
             logger.info("Standard extraction failed, attempting OCR...")
-            ocr_text = self._extract_with_ocr(pdf_content)
+            ocr_text = self._extract_with_ocr(pdf_content, max_chars)
             if ocr_text and len(ocr_text.strip()) >= 50:
                 cleaned_text = self._clean_extracted_text(ocr_text)
                 logger.info(f"OCR extracted {len(cleaned_text)} characters")
@@ -156,7 +220,7 @@ class PDFService:
             logger.error(f"PDF processing error: {str(e)}")
             raise PDFProcessingError(f"Failed to process PDF: {str(e)}")
 
-    def _extract_with_pymupdf(self, pdf_content: bytes) -> str:
+    def _extract_with_pymupdf(self, pdf_content: bytes, max_chars: Optional[int] = None) -> str:
         """
         Extract text using PyMuPDF (fitz) - handles complex fonts better.
         """
@@ -166,13 +230,16 @@ class PDFService:
             pdf_file = io.BytesIO(pdf_content)
             doc = fitz.open(stream=pdf_file, filetype="pdf")
             text_parts = []
+            total = 0
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
+            for page in doc:
                 # Use "text" for plain text, preserves layout better
                 text = page.get_text("text")
                 if text:
                     text_parts.append(text)
+                    total += len(text)
+                    if max_chars and total >= max_chars:
+                        break
             
             doc.close()
             return "\n".join(text_parts)
@@ -184,7 +251,7 @@ class PDFService:
             logger.warning(f"PyMuPDF extraction failed: {str(e)}")
             return ""
 
-    def _extract_with_pdfplumber(self, pdf_content: bytes) -> str:
+    def _extract_with_pdfplumber(self, pdf_content: bytes, max_chars: Optional[int] = None) -> str:
         """
         Extract text using pdfplumber.
         """
@@ -193,6 +260,7 @@ class PDFService:
             
             pdf_file = io.BytesIO(pdf_content)
             text_parts = []
+            total = 0
 
             with pdfplumber.open(pdf_file) as pdf:
                 for page in pdf.pages:
@@ -200,6 +268,7 @@ class PDFService:
                     page_text = page.extract_text()
                     if page_text:
                         text_parts.append(page_text)
+                        total += len(page_text)
                     
                     # Also try extracting tables and convert to text
                     tables = page.extract_tables()
@@ -209,6 +278,14 @@ class PDFService:
                                 if row:
                                     row_text = " | ".join([str(cell) if cell else "" for cell in row])
                                     text_parts.append(row_text)
+                                    total += len(row_text)
+                    
+                    # Release the page's cached layout objects so memory stays
+                    # bounded by one page rather than the whole document
+                    page.close()
+                    
+                    if max_chars and total >= max_chars:
+                        break
 
             return "\n".join(text_parts)
 
@@ -219,7 +296,7 @@ class PDFService:
             logger.warning(f"pdfplumber extraction failed: {str(e)}")
             return ""
 
-    def _extract_with_pypdf2(self, pdf_content: bytes) -> str:
+    def _extract_with_pypdf2(self, pdf_content: bytes, max_chars: Optional[int] = None) -> str:
         """
         Extract text using PyPDF2.
         """
@@ -229,11 +306,15 @@ class PDFService:
             pdf_file = io.BytesIO(pdf_content)
             pdf_reader = PdfReader(pdf_file)
             text_parts = []
+            total = 0
 
             for page in pdf_reader.pages:
                 page_text = page.extract_text()
                 if page_text:
                     text_parts.append(page_text)
+                    total += len(page_text)
+                    if max_chars and total >= max_chars:
+                        break
 
             return "\n".join(text_parts)
 
@@ -244,7 +325,7 @@ class PDFService:
             logger.warning(f"PyPDF2 extraction failed: {str(e)}")
             return ""
 
-    def _extract_with_ocr(self, pdf_content: bytes) -> str:
+    def _extract_with_ocr(self, pdf_content: bytes, max_chars: Optional[int] = None) -> str:
         """
         Extract text using OCR (Optical Character Recognition).
         Converts PDF pages to images and runs OCR.
@@ -257,6 +338,7 @@ class PDFService:
             pdf_file = io.BytesIO(pdf_content)
             doc = fitz.open(stream=pdf_file, filetype="pdf")
             text_parts = []
+            total = 0
             
             for page_num in range(min(len(doc), 10)):  # Limit to first 10 pages for OCR
                 page = doc[page_num]
@@ -271,6 +353,9 @@ class PDFService:
                 page_text = pytesseract.image_to_string(img, lang='eng')
                 if page_text:
                     text_parts.append(page_text)
+                    total += len(page_text)
+                    if max_chars and total >= max_chars:
+                        break
             
             doc.close()
             return "\n".join(text_parts)
@@ -391,5 +476,10 @@ class PDFService:
             return False, f"Invalid PDF file: {str(e)}"
 
 
+def _extract_text_worker(pdf_content: bytes, max_chars: Optional[int]) -> str:
+    """Process-pool entry point; uses the worker's own service instance."""
+    return pdf_service._extract_text_sync(pdf_content, max_chars)
+
+
 # Global PDF service instance
 pdf_service = PDFService()
@@ -184,7 +184,7 @@ class RawExtractionStorageService:
         """Add a source document to the extraction."""
         import uuid
         
-        source_id = str(uuid.uuid4())[:8]
+        source_id = uuid.uuid4().hex[:8]
         
         source_doc = {
             "source_id": source_id,
@@ -242,7 +242,7 @@ class RawExtractionStorageService:
         section_docs = []
         for section_data in sections:
             section_doc = {
-                "section_id": str(uuid.uuid4())[:8],
+                "section_id": uuid.uuid4().hex[:8],
                 "source_url": source_url,
                 "content": section_data.get("content", ""),
                 "content_length": len(section_data.get("content", "")),
@@ -0,0 +1,9 @@
+"""Shared test configuration."""
+import os
+import tempfile
+
+# Settings are read when app is first imported, so point the loguru file
+# sinks at a scratch directory before any test module imports app.
+_LOG_DIR = tempfile.mkdtemp(prefix="data-extraction-tests-")
+os.environ["LOG_FILE"] = os.path.join(_LOG_DIR, "app.log")
+os.environ["LOG_ERROR_FILE"] = os.path.join(_LOG_DIR, "error.log")
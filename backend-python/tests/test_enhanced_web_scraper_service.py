@@ -0,0 +1,237 @@
+"""Tests for the enhanced web scraper's HTTP fetch path."""
+import time
+
+import httpx
+import pytest
+
+from app.services.enhanced_web_scraper_service import (
+    EnhancedWebScraperService,
+    MAIN_PAGE_STRAINER,
+    _bank_extraction_profile,
+)
+from app.services.pdf_service import pdf_service
+
+
+RELATED_URL = "https://bank.example/cards/terms"
+PDF_URL = "https://bank.example/-/media/key-facts.pdf"
+PDF_TEXT = "Key facts statement. Annual fee AED 500. Minimum salary AED 15,000."
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry backoff instead of sleeping."""
+    calls = []
+
+    async def fake_sleep(seconds):
+        calls.append(seconds)
+
+    monkeypatch.setattr("asyncio.sleep", fake_sleep)
+    return calls
+
+
+def make_service(handler) -> EnhancedWebScraperService:
+    service = EnhancedWebScraperService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+class TestConditionalFetch:
+    async def test_not_modified_serves_cached_text_without_retrying(self, sleeps):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(304)
+
+        service = make_service(handler)
+        cache_key = (RELATED_URL, _bank_extraction_profile({}))
+        service._cache_link(cache_key, "cached terms text", '"v1"', "Mon, 01 Jan 2024 00:00:00 GMT")
+        # Stale entry: must be revalidated rather than served directly
+        service._link_cache[cache_key].stored_at = time.monotonic() - service.link_cache_ttl - 1
+
+        text = await service._fetch_related_url(RELATED_URL, bank_config={}, is_pdf=False)
+
+        assert text == "cached terms text"
+        assert len(requests) == 1
+        assert requests[0].headers["If-None-Match"] == '"v1"'
+        assert requests[0].headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert sleeps == []
+
+    async def test_not_modified_without_cached_entry_is_not_served(self, sleeps):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(304)
+
+        service = make_service(handler)
+
+        text = await service._fetch_related_url(RELATED_URL, bank_config={}, is_pdf=False)
+
+        assert text is None
+        assert "If-None-Match" not in requests[0].headers
+        assert len(requests) == service.retry_attempts
+
+
+class TestLinkCache:
+    async def test_entries_are_keyed_by_extraction_profile(self, sleeps):
+        requests = []
+        page = "<html><body><main>{}</main><aside>{}</aside></body></html>".format(
+            "Annual fee AED 500 waived in the first year. " * 3,
+            "Complimentary lounge access for primary cardholders. " * 3,
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, html=page)
+
+        service = make_service(handler)
+
+        main_only = await service._fetch_related_url(
+            RELATED_URL, bank_config={"content_selectors": ["main"]}, is_pdf=False
+        )
+        whole_page = await service._fetch_related_url(RELATED_URL, bank_config={}, is_pdf=False)
+
+        assert len(requests) == 2
+        assert "lounge" not in main_only
+        assert "lounge" in whole_page
+
+
+class TestNonHtmlResponses:
+    async def test_plain_text_is_returned_as_decoded(self, sleeps):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, text="Terms and conditions apply. Annual fee AED 500.")
+
+        service = make_service(handler)
+
+        response = await service._fetch_html(RELATED_URL)
+
+        assert response.text == "Terms and conditions apply. Annual fee AED 500."
+        assert len(requests) == 1
+        assert sleeps == []
+
+    async def test_json_body_is_returned_without_retrying(self, sleeps):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"annual_fee": "AED 500"})
+
+        service = make_service(handler)
+
+        response = await service._fetch_html(RELATED_URL)
+
+        assert response.json() == {"annual_fee": "AED 500"}
+        assert len(requests) == 1
+        assert sleeps == []
+
+    async def test_empty_body_is_retried_then_returned(self, sleeps):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, text="")
+
+        service = make_service(handler)
+
+        response = await service._fetch_html(RELATED_URL)
+
+        assert response.text == ""
+        assert len(requests) == service.retry_attempts
+        assert len(sleeps) == service.retry_attempts - 1
+
+
+class TestCleanText:
+    def test_strained_page_title_stays_out_of_body_text(self):
+        service = EnhancedWebScraperService()
+        soup = service._parse_html(
+            "<html><head><title>Skywards Card | Bank</title></head>"
+            "<body><p>Annual fee AED 500</p></body></html>",
+            MAIN_PAGE_STRAINER,
+        )
+
+        assert service._extract_clean_text(soup, {}) == "Annual fee AED 500"
+
+    def test_related_page_keeps_text_outside_block_tags(self):
+        service = EnhancedWebScraperService()
+        service.use_selectolax = False
+        html = (
+            "<html><body>Terms apply to all cardholders."
+            "<span>Annual fee AED 500</span>"
+            "<form><label>Minimum salary AED 15,000</label></form>"
+            "</body></html>"
+        )
+
+        text = service._extract_related_text(html, {}, max_chars=1000)
+
+        assert text.splitlines() == [
+            "Terms apply to all cardholders.",
+            "Annual fee AED 500",
+            "Minimum salary AED 15,000",
+        ]
+
+
+@pytest.fixture
+def pdf_downloads(monkeypatch):
+    """Record PDF downloads instead of fetching and parsing them."""
+    calls = []
+
+    async def fake_extract_text_from_url(url, max_chars=None):
+        calls.append(url)
+        return PDF_TEXT
+
+    monkeypatch.setattr(pdf_service, "extract_text_from_url", fake_extract_text_from_url)
+    return calls
+
+
+def head_handler(headers):
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == "HEAD"
+        return httpx.Response(200, headers=headers)
+    return handler
+
+
+class TestPdfProbe:
+    @pytest.mark.parametrize("content_type", [
+        "application/pdf",
+        "application/force-download",
+        "binary/octet-stream",
+        None,
+    ])
+    async def test_non_text_content_types_are_downloaded(self, pdf_downloads, content_type):
+        headers = {"content-type": content_type} if content_type else {}
+        service = make_service(head_handler(headers))
+
+        text = await service._fetch_related_url(PDF_URL, bank_config={}, is_pdf=True)
+
+        assert text == PDF_TEXT
+        assert pdf_downloads == [PDF_URL]
+
+    @pytest.mark.parametrize("content_type", ["text/html; charset=utf-8", "text/plain"])
+    async def test_html_and_text_responses_are_skipped(self, pdf_downloads, content_type):
+        service = make_service(head_handler({"content-type": content_type}))
+
+        text = await service._fetch_related_url(PDF_URL, bank_config={}, is_pdf=True)
+
+        assert text is None
+        assert pdf_downloads == []
+
+    async def test_malformed_content_length_does_not_skip(self, pdf_downloads):
+        service = make_service(head_handler({"content-type": "application/pdf", "content-length": "unknown"}))
+
+        text = await service._fetch_related_url(PDF_URL, bank_config={}, is_pdf=True)
+
+        assert text == PDF_TEXT
+        assert pdf_downloads == [PDF_URL]
+
+    async def test_oversized_pdf_is_skipped(self, pdf_downloads):
+        too_large = str(pdf_service.max_size_bytes + 1)
+        service = make_service(head_handler({"content-type": "application/pdf", "content-length": too_large}))
+
+        text = await service._fetch_related_url(PDF_URL, bank_config={}, is_pdf=True)
+
+        assert text is None
+        assert pdf_downloads == []
@@ -0,0 +1,185 @@
+"""Tests for the intelligence extraction service."""
+import pytest
+
+from app.services import intelligence_extraction_service as intelligence_module
+from app.services.intelligence_extraction_service import (
+    IntelligenceExtractionService,
+    SEGMENT_BREAK_RE,
+    _iter_segments,
+)
+
+
+# Card content in the shape produced by EnhancedWebScraperService.format_for_llm
+FORMATTED_CARD_CONTENT = """=== CREDIT CARD: Skywards Signature Card ===
+Source: https://bank.example/cards/skywards
+
+=== FEES SECTIONS ===
+
+## Fees and charges
+Annual Fee: AED 1,500
+Joining fee: Free
+Interest rate: 3.25% per month
+
+=== BENEFITS SECTIONS ===
+
+## Cashback
+5% cashback on dining
+2% on groceries
+1% on everything else
+
+## Lounge access
+Complimentary airport lounge access at 1,000+ lounges worldwide for the primary cardholder.
+
+=== ELIGIBILITY SECTIONS ===
+
+## Eligibility
+Minimum salary: AED 15,000
+Age: 21 to 65 years
+"""
+
+
+# Main-page text in the shape produced by EnhancedWebScraperService._extract_clean_text:
+# one line per text node, joined by single newlines
+SCRAPED_CARD_LINES = [
+    "Skywards Signature Credit Card",
+    "Apply now",
+    "Earn 3 Skywards Miles for every USD 1 spent on Emirates and flydubai",
+    "Earn 1.5 Skywards Miles for every USD 1 spent on international purchases",
+    "Complimentary access to over 1,000 airport lounges worldwide",
+    "Enjoy 2 for 1 cinema tickets at VOX and Reel Cinemas every month",
+    "Up to 25% discount at partner restaurants across the UAE",
+    "Complimentary travel insurance for you and your family",
+    "Annual Fee: AED 1,500",
+    "Minimum salary: AED 15,000",
+] + [
+    f"Golf: complimentary green fees at participating course number {i} in the region"
+    for i in range(12)
+]
+SCRAPED_CARD_CONTENT = "\n".join(SCRAPED_CARD_LINES)
+
+
+class TestPreprocessContent:
+    def test_fee_and_percentage_lines_survive(self):
+        service = IntelligenceExtractionService()
+
+        result, sections = service._preprocess_content(FORMATTED_CARD_CONTENT, max_length=20000)
+
+        for line in (
+            "Annual Fee: AED 1,500",
+            "Interest rate: 3.25% per month",
+            "5% cashback on dining",
+            "2% on groceries",
+            "Minimum salary: AED 15,000",
+        ):
+            assert line in result
+        assert any(is_selected for _, _, is_selected in sections)
+
+    def test_single_newline_content_splits_on_lines(self):
+        service = IntelligenceExtractionService()
+
+        result, sections = service._preprocess_content(SCRAPED_CARD_CONTENT, max_length=20000)
+
+        assert len(SCRAPED_CARD_CONTENT) > 1000
+        assert "Earn 3 Skywards Miles for every USD 1 spent on Emirates and flydubai" in result
+        # Sections follow line boundaries instead of fixed-size chunks cut mid-word
+        for _, section, _ in sections:
+            assert any(section.startswith(line) for line in SCRAPED_CARD_LINES)
+
+    def test_cache_hit_returns_an_independent_section_list(self):
+        service = IntelligenceExtractionService()
+
+        _, first = service._preprocess_content(FORMATTED_CARD_CONTENT, max_length=20000)
+        expected = list(first)
+        first.clear()
+        _, second = service._preprocess_content(FORMATTED_CARD_CONTENT, max_length=20000)
+
+        assert second == expected
+
+    def test_percentage_sections_keep_their_keyword_hit(self):
+        service = IntelligenceExtractionService()
+
+        _, sections = service._preprocess_content("5% back on groceries at partner supermarkets")
+
+        # '%' and 'partner' keyword hits plus the value-amount boost, as before the core/context split
+        assert [score for score, _, _ in sections] == [7]
+
+    def test_unselected_sections_stay_in_score_order(self):
+        service = IntelligenceExtractionService()
+
+        _, sections = service._preprocess_content(SCRAPED_CARD_CONTENT, max_length=200)
+
+        scores = [score for score, _, _ in sections]
+        assert not all(is_selected for _, _, is_selected in sections)
+        assert scores == sorted(scores, reverse=True)
+
+
+class TestIterSegments:
+    def test_short_fragments_are_merged_not_dropped(self):
+        text = "Annual Fee: AED 500\n\nCashback: 5%\n\nComplimentary lounge access worldwide for cardholders."
+
+        segments = list(_iter_segments(text, SEGMENT_BREAK_RE))
+
+        joined = "\n\n".join(segments)
+        assert "Annual Fee: AED 500" in joined
+        assert "Cashback: 5%" in joined
+
+    def test_short_tail_joins_previous_segment(self):
+        text = "Complimentary lounge access worldwide for cardholders.\n\nFee: AED 500"
+
+        assert list(_iter_segments(text, SEGMENT_BREAK_RE)) == [text]
+
+    def test_does_not_split_before_percentages_or_amounts(self):
+        text = "Earn cashback on every purchase 5% on dining and AED 100 welcome bonus"
+
+        assert list(_iter_segments(text, SEGMENT_BREAK_RE)) == [text]
+
+    def test_single_newlines_are_boundaries(self):
+        text = (
+            "Complimentary lounge access at 1,000+ airports worldwide\n"
+            "Annual Fee: AED 500\n"
+            "Earn 3 Skywards Miles for every USD 1 spent on Emirates"
+        )
+
+        assert list(_iter_segments(text, SEGMENT_BREAK_RE)) == [
+            "Complimentary lounge access at 1,000+ airports worldwide",
+            "Annual Fee: AED 500\nEarn 3 Skywards Miles for every USD 1 spent on Emirates",
+        ]
+
+
+@pytest.fixture
+def llm_cache(monkeypatch):
+    """In-memory stand-in for the Redis-backed LLM response cache."""
+    store = {}
+
+    async def fake_get(key):
+        return store.get(key)
+
+    async def fake_set(key, value, ttl=None):
+        store[key] = value
+        return True
+
+    monkeypatch.setattr(intelligence_module.cache_service, "get", fake_get)
+    monkeypatch.setattr(intelligence_module.cache_service, "set", fake_set)
+    return store
+
+
+class TestCallLlmWithRetry:
+    async def test_unparseable_response_is_not_cached(self, llm_cache, monkeypatch):
+        responses = iter(["Sorry, I cannot help with that.", '{"intelligence_items": [{"title": "Lounge"}]}'])
+        prompts = []
+
+        async def fake_generate(prompt, **kwargs):
+            prompts.append(prompt)
+            return next(responses)
+
+        monkeypatch.setattr(intelligence_module.ollama_client, "generate", fake_generate)
+        service = IntelligenceExtractionService()
+        service.stream_responses = False
+
+        first = await service._call_llm_with_retry("extract this card")
+        second = await service._call_llm_with_retry("extract this card")
+
+        assert first == "Sorry, I cannot help with that."
+        assert second == '{"intelligence_items": [{"title": "Lounge"}]}'
+        assert len(prompts) == 2
+        assert list(llm_cache.values()) == [second]